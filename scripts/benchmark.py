@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Offline Benchmarks for Variant Generation and the Lab 1 Grading Harness
+
+Measures:
+    - variants/second for single-student and batch generation (get_variant.py)
+    - run_script() cost per script, cold (fresh cache) and warm (cached),
+      for each harness runner
+    - end-to-end visible-suite time for one repo (pytest) and for N
+      synthetic repos (grade_cohort.py)
+
+Results are written as JSON so runs can be compared against a baseline.
+
+Usage:
+    python scripts/benchmark.py --save baseline.json
+    python scripts/benchmark.py --compare baseline.json --tolerance 0.25
+    python scripts/benchmark.py --quick
+"""
+
+import argparse
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import grade_cohort  # noqa: E402
+
+REPO_ROOT = grade_cohort.REPO_ROOT
+SRC_DIR = REPO_ROOT / 'src'
+
+# Metrics where a larger value is better; everything else is a duration
+HIGHER_IS_BETTER = {'variants_single_per_s', 'variants_batch_per_s'}
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    """Best wall time in seconds over `repeat` calls."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def bench_variants(count: int, repeat: int) -> Dict[str, float]:
+    """Variants per second for the single and batch APIs."""
+    get_variant = grade_cohort.load_variant_module()
+    runs = iter(range(repeat * 2))
+
+    def single():
+        # Fresh IDs per repeat so the LRU memo never hits
+        run = next(runs)
+        for i in range(count):
+            get_variant.get_variant_for_student(f'bench{run}-{i}')
+
+    def batch():
+        run = next(runs)
+        for _ in get_variant.get_variants_for_students(f'bench{run}-{i}' for i in range(count)):
+            pass
+
+    return {
+        'variants_single_per_s': count / best_of(single, repeat),
+        'variants_batch_per_s': count / best_of(batch, repeat),
+    }
+
+
+def _clear_harness_caches(harness: Any) -> None:
+    """Forget every cached run, output, compiled script and static derivation."""
+    for cache in (harness._RUN_CACHE, harness._OUTPUT_CACHE,
+                  harness._CODE_CACHE, harness._STATIC_CACHE):
+        cache.clear()
+
+
+def bench_run_script(repeat: int) -> Dict[str, float]:
+    """
+    Seconds per run_script() call, per runner and script, cold and warm.
+
+    Runners are timed with the static pre-check off so every cold call
+    really executes the script; the pre-check gets its own `static` rows,
+    for the scripts whose output it can derive.
+    """
+    test_module = grade_cohort.load_test_module()
+    harness = sys.modules['harness']
+    test_module.SRC_DIR = SRC_DIR
+    scripts = sorted(p.name for p in SRC_DIR.glob('lab1_*.py'))
+    stdin = {'lab1_input.py': 'GEO-001\nGranite\n2.5\n200\n'}
+
+    def timings(label: str, script: str) -> None:
+        path = SRC_DIR / script
+
+        def cold():
+            _clear_harness_caches(harness)
+            harness.run_script(path, stdin.get(script))
+
+        def warm():
+            harness.run_script(path, stdin.get(script))
+
+        results[f'run_script_cold_s[{label}:{script}]'] = best_of(cold, repeat)
+        results[f'run_script_warm_s[{label}:{script}]'] = best_of(warm, repeat)
+
+    results = {}
+    previous_runner = harness.get_runner()
+    previous_precheck = harness._static_precheck
+    try:
+        harness.set_static_precheck(False)
+        for runner in harness.RUNNERS:
+            harness.set_runner(runner)
+            for script in scripts:
+                timings(runner, script)
+
+        harness.set_static_precheck(True)
+        for script in scripts:
+            if harness.static_script(SRC_DIR / script).stdout is not None:
+                timings(harness.STATIC, script)
+    finally:
+        harness.set_runner(previous_runner)
+        harness.set_static_precheck(previous_precheck)
+        _clear_harness_caches(harness)
+    return results
+
+
+def bench_visible_suite(repeat: int) -> Dict[str, float]:
+    """End-to-end pytest run of tests/visible/ for this repository."""
+    def run():
+        subprocess.run([sys.executable, '-m', 'pytest', '-q', '-p', 'no:cacheprovider',
+                        str(REPO_ROOT / 'tests' / 'visible')],
+                       cwd=REPO_ROOT, capture_output=True, check=False)
+    return {'visible_suite_s': best_of(run, repeat)}
+
+
+def bench_cohort(num_repos: int, repeat: int, workers: Optional[int]) -> Dict[str, float]:
+    """Grade N synthetic copies of this repository's src/ with grade_cohort."""
+    with tempfile.TemporaryDirectory() as tmp:
+        submissions = Path(tmp)
+        for i in range(num_repos):
+            shutil.copytree(SRC_DIR, submissions / f'ggy3061-lab01-synthetic{i}' / 'src')
+
+        def run():
+            grade_cohort.grade_cohort(submissions, workers=workers)
+        total = best_of(run, repeat)
+    return {
+        f'cohort_{num_repos}_repos_s': total,
+        'cohort_per_repo_s': total / num_repos,
+    }
+
+
+def run_benchmarks(quick: bool = False, workers: Optional[int] = None) -> Dict[str, Any]:
+    """Run every benchmark and return a JSON-serializable result document."""
+    repeat = 1 if quick else 3
+    results: Dict[str, float] = {}
+    results.update(bench_variants(2000 if quick else 20000, repeat))
+    results.update(bench_run_script(repeat))
+    results.update(bench_visible_suite(repeat))
+    results.update(bench_cohort(4 if quick else 20, repeat, workers))
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'quick': quick,
+        },
+        'results': {name: round(value, 6) for name, value in results.items()},
+    }
+
+
+# ============================================================================
+# BASELINE COMPARISON
+# ============================================================================
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            tolerance: float) -> List[str]:
+    """Return a line per metric that regressed by more than `tolerance`."""
+    regressions = []
+    for name, base in baseline['results'].items():
+        value = current['results'].get(name)
+        if value is None or not base:
+            continue
+        if name in HIGHER_IS_BETTER:
+            change = (base - value) / base
+        else:
+            change = (value - base) / base
+        if change > tolerance:
+            regressions.append(f'{name}: {base:.6g} -> {value:.6g} ({change:+.0%} worse)')
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark variant generation and grading.')
+    parser.add_argument('--save', metavar='FILE', help='Write results as JSON')
+    parser.add_argument('--compare', metavar='FILE', help='Baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed relative slowdown before reporting (default: 0.25)')
+    parser.add_argument('--quick', action='store_true', help='Smaller workloads, one repeat')
+    parser.add_argument('--workers', type=int, help='Workers for the cohort benchmark')
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(quick=args.quick, workers=args.workers)
+    for name, value in current['results'].items():
+        print(f'{name:60s} {value:>14.6g}')
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance)
+        if regressions:
+            print('\nRegressions:')
+            for line in regressions:
+                print(f'  {line}')
+            return 1
+        print('\nNo regressions beyond tolerance.')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
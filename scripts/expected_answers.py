@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Expected Answers for GGY3061 Lab 1
+
+Computes what a correct submission prints for a given variant, exactly as
+the lab files specify it:
+
+    lab1_calculations.py   Density, Drilling interval, Average depth, Core volume
+    lab1_input.py          the "--- Sample Summary ---" block and classification
+
+AnswerIndex precomputes these once per distinct parameter set. With
+PARAMETER_SCOPE = "group" in get_variant.py that is one entry per variant
+group, so grading a submission is a dictionary lookup.
+
+Usage:
+    # Index for a roster (one entry per distinct variant):
+    python scripts/expected_answers.py --roster roster.csv --output answers.json
+
+    # Index for every group (PARAMETER_SCOPE = "group" only):
+    python scripts/expected_answers.py --groups --output answers.json
+
+    # Task 3 answers for a whole cohort in one vectorized pass (CSV out):
+    python scripts/expected_answers.py --roster roster.csv --bulk --output answers.csv
+"""
+
+import argparse
+import csv
+import json
+import math
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy
+except ImportError:  # optional; plain array-module loops are used instead
+    numpy = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import get_variant  # noqa: E402
+
+# Constants fixed by the lab instructions
+DEPTH_START = 100           # meters (lab1_calculations.py: "keep this value")
+CORE_RADIUS = 0.05          # meters
+ECONOMIC_THRESHOLD = 2.0    # grade % (lab1_input.py)
+SAMPLE_ID = 'GEO-001'       # sample ID fed to lab1_input.py
+
+
+# ============================================================================
+# EXPECTED OUTPUT
+# ============================================================================
+
+def expected_calculations(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Expected Task 3 results for one set of parameters.
+
+    Uses the same expressions, in the same order, as the lab instructions
+    so the floating-point results (and their formatting) match exactly.
+    """
+    mass = params['sample_mass']
+    volume = params['sample_volume']
+    depth_end = params['sample_depth']
+
+    density = mass / volume
+    interval = depth_end - DEPTH_START
+    average = (DEPTH_START + depth_end) / 2
+    core_volume = math.pi * CORE_RADIUS**2 * interval
+
+    return {
+        'density': density,
+        'drilling_interval': interval,
+        'average_depth': average,
+        'core_volume': core_volume,
+        'lines': {
+            'Density': f'{density:.2f} kg/m3',
+            'Drilling interval': f'{interval} meters',
+            'Average depth': f'{average:.1f} meters',
+            'Core volume': f'{core_volume:.4f} cubic meters',
+        },
+    }
+
+
+def classify_grade(grade: float) -> str:
+    """Task 4 classification of an ore grade."""
+    return 'Economic' if grade >= ECONOMIC_THRESHOLD else 'Sub-economic'
+
+
+def input_scenario(sample_id: str, rock_type: str, grade: float, depth: int) -> Dict[str, Any]:
+    """stdin payload for lab1_input.py and the summary lines it should print."""
+    return {
+        'stdin': f'{sample_id}\n{rock_type}\n{grade}\n{depth}\n',
+        'lines': [
+            '--- Sample Summary ---',
+            f'Sample ID: {sample_id}',
+            f'Rock Type: {rock_type}',
+            f'Grade: {grade:.2f}%',
+            f'Depth: {depth} meters',
+            f'Classification: {classify_grade(grade)}',
+        ],
+    }
+
+
+def expected_answers(params: Dict[str, Any]) -> Dict[str, Any]:
+    """All precomputable expected answers for one variant's parameters."""
+    return {
+        'parameters': dict(params),
+        'calculations': expected_calculations(params),
+        'input_summary': input_scenario(SAMPLE_ID, params['rock_type'],
+                                        params['grade_value'], params['sample_depth']),
+    }
+
+
+# ============================================================================
+# BULK (COLUMNAR) COMPUTATION
+# ============================================================================
+
+def parameter_columns(student_ids: Iterable[str]) -> Dict[str, Any]:
+    """
+    Collect a cohort's Task 3 parameters as columnar arrays.
+
+    Returns:
+        Dict with 'student_id' (list) and 'sample_mass', 'sample_volume'
+        (array('d')) and 'sample_depth' (array('q'))
+    """
+    columns = {
+        'student_id': [],
+        'sample_mass': array('d'),
+        'sample_volume': array('d'),
+        'sample_depth': array('q'),
+    }
+    for variant in get_variant.get_variants_for_students(student_ids):
+        params = variant['parameters']
+        columns['student_id'].append(variant['student_id'])
+        columns['sample_mass'].append(params['sample_mass'])
+        columns['sample_volume'].append(params['sample_volume'])
+        columns['sample_depth'].append(params['sample_depth'])
+    return columns
+
+
+def expected_calculations_bulk(masses: Sequence[float], volumes: Sequence[float],
+                               depths: Sequence[int],
+                               use_numpy: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Vectorized expected_calculations() over whole columns.
+
+    Uses NumPy when available (use_numpy=None) or when use_numpy=True,
+    otherwise array-module loops. Both evaluate the same float64 expressions in the
+    same order as expected_calculations(), so the values and formatted
+    strings are identical to the scalar path.
+
+    Returns:
+        Dict of columns: density, drilling_interval, average_depth,
+        core_volume, and the formatted line text for each
+
+    Raises:
+        ImportError: use_numpy=True but NumPy is not installed
+    """
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    elif use_numpy and numpy is None:
+        raise ImportError('use_numpy=True requires NumPy, which is not installed; '
+                          'pass use_numpy=None to fall back to array loops')
+    core_factor = math.pi * CORE_RADIUS**2
+
+    if use_numpy:
+        mass = numpy.asarray(masses, dtype=numpy.float64)
+        volume = numpy.asarray(volumes, dtype=numpy.float64)
+        depth_end = numpy.asarray(depths, dtype=numpy.int64)
+        density = (mass / volume).tolist()
+        interval_array = depth_end - DEPTH_START
+        average = ((DEPTH_START + depth_end) / 2).tolist()
+        core_volume = (core_factor * interval_array).tolist()
+        interval = interval_array.tolist()
+    else:
+        density = array('d', (m / v for m, v in zip(masses, volumes)))
+        interval = array('q', (d - DEPTH_START for d in depths))
+        average = array('d', ((DEPTH_START + d) / 2 for d in depths))
+        core_volume = array('d', (core_factor * i for i in interval))
+
+    return {
+        'density': density,
+        'drilling_interval': interval,
+        'average_depth': average,
+        'core_volume': core_volume,
+        'Density': [f'{x:.2f} kg/m3' for x in density],
+        'Drilling interval': [f'{x} meters' for x in interval],
+        'Average depth': [f'{x:.1f} meters' for x in average],
+        'Core volume': [f'{x:.4f} cubic meters' for x in core_volume],
+    }
+
+
+def write_bulk_csv(student_ids: List[str], bulk: Dict[str, Any], out) -> None:
+    """Write one row of formatted Task 3 answers per student."""
+    labels = ('Density', 'Drilling interval', 'Average depth', 'Core volume')
+    writer = csv.writer(out)
+    writer.writerow(['student_id', *labels])
+    for row in zip(student_ids, *(bulk[label] for label in labels)):
+        writer.writerow(row)
+
+
+# ============================================================================
+# LOOKUP INDEX
+# ============================================================================
+
+def variant_key(params: Dict[str, Any]) -> str:
+    """Stable key identifying a distinct parameter set."""
+    return '|'.join(str(params[name]) for name in sorted(params))
+
+
+class AnswerIndex:
+    """
+    Expected answers keyed by distinct parameter set.
+
+    Attributes:
+        answers: variant key -> expected_answers() dict
+        students: student ID -> variant key
+    """
+
+    def __init__(self, answers: Optional[Dict[str, Dict[str, Any]]] = None,
+                 students: Optional[Dict[str, str]] = None):
+        self.answers = answers or {}
+        self.students = students or {}
+
+    def add_variant(self, variant: Dict[str, Any]) -> str:
+        """Register a student's variant, computing answers only for new parameter sets."""
+        key = variant_key(variant['parameters'])
+        if key not in self.answers:
+            self.answers[key] = expected_answers(variant['parameters'])
+        self.students[variant['student_id']] = key
+        return key
+
+    @classmethod
+    def for_students(cls, student_ids: Iterable[str]) -> 'AnswerIndex':
+        """Build the index for a roster in one pass."""
+        index = cls()
+        for variant in get_variant.get_variants_for_students(student_ids):
+            index.add_variant(variant)
+        return index
+
+    @classmethod
+    def for_groups(cls) -> 'AnswerIndex':
+        """Build the index for every variant group (requires PARAMETER_SCOPE = 'group')."""
+        if get_variant.PARAMETER_SCOPE != 'group':
+            raise ValueError("Per-group answers need PARAMETER_SCOPE = 'group' in get_variant.py")
+        index = cls()
+        for group_id in range(get_variant.NUM_GROUPS):
+            params = get_variant.parameters_for_seed(get_variant.compute_group_seed(group_id),
+                                                     group_id)
+            index.answers[variant_key(params)] = expected_answers(params)
+        return index
+
+    def for_student(self, student_id: str) -> Dict[str, Any]:
+        """Expected answers for a student; unknown students are added on the fly."""
+        key = self.students.get(student_id)
+        if key is None:
+            key = self.add_variant(get_variant.get_variant_for_student(student_id))
+        return self.answers[key]
+
+    def save(self, path: str) -> None:
+        """Write the index as JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': get_variant.config_fingerprint(),
+                       'answers': self.answers, 'students': self.students}, f)
+
+    @classmethod
+    def load(cls, path: str) -> 'AnswerIndex':
+        """Read an index written by save(); stale indexes load empty."""
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('fingerprint') != get_variant.config_fingerprint():
+            return cls()
+        return cls(data['answers'], data['students'])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Precompute Lab 1 expected answers.')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--roster', metavar='FILE', help='CSV or JSONL roster of student IDs')
+    source.add_argument('--groups', action='store_true',
+                        help="One entry per variant group (PARAMETER_SCOPE = 'group')")
+    parser.add_argument('--bulk', action='store_true',
+                        help='With --roster: write Task 3 answers per student as CSV')
+    parser.add_argument('--output', metavar='FILE', required=True,
+                        help='Index JSON path (with --bulk: CSV of Task 3 answers)')
+    args = parser.parse_args(argv)
+
+    if args.bulk:
+        if not args.roster:
+            parser.error('--bulk requires --roster')
+        columns = parameter_columns(get_variant.read_roster(args.roster))
+        bulk = expected_calculations_bulk(columns['sample_mass'], columns['sample_volume'],
+                                          columns['sample_depth'])
+        with open(args.output, 'w', newline='', encoding='utf-8') as f:
+            write_bulk_csv(columns['student_id'], bulk, f)
+        print(f"{len(columns['student_id'])} students -> {args.output}")
+        return 0
+
+    if args.groups:
+        try:
+            index = AnswerIndex.for_groups()
+        except ValueError as exc:
+            parser.error(str(exc))
+    else:
+        index = AnswerIndex.for_students(get_variant.read_roster(args.roster))
+    index.save(args.output)
+    print(f'{len(index.answers)} parameter sets, {len(index.students)} students -> {args.output}')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
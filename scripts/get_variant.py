@@ -9,19 +9,35 @@ Usage:
     # As a script (for students to see their values):
     python scripts/get_variant.py
     
+    # Compact single-line JSON (newline-delimited), e.g. for CI:
+    python scripts/get_variant.py --json --output .variant_config.json
+    
+    # Whole-cohort roster (CSV or JSONL in, JSONL or CSV out):
+    python scripts/get_variant.py --roster roster.csv --format csv --output variants.csv
+    
     # As a module (for tests):
     from scripts.get_variant import get_my_variant, get_variant_for_student
     variant = get_my_variant()
     params = variant['parameters']
 """
 
+from __future__ import annotations
+
+# Only what every code path needs is imported here. argparse, csv, json,
+# pathlib and subprocess are imported inside the functions that use them,
+# so importing this module (or computing a variant) stays cheap.
+# tests/tooling/test_get_variant_startup.py holds the cold-start budget.
+import functools
 import hashlib
+import itertools
 import random
-import json
 import os
-import subprocess
-from pathlib import Path
-from typing import Dict, Any, Optional
+import sys
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Dict, Any, Iterable, Iterator, List, Optional, TextIO
 
 
 # ============================================================================
@@ -33,6 +49,33 @@ ASSIGNMENT_ID = "lab01"
 VARIANT_STRATEGY = "grouped"
 NUM_GROUPS = 10
 
+# 'student': parameters come from each student's own seed (lab01 values).
+# 'group': every student in a group shares one parameter set, so expected
+#          answers can be precomputed once per group.
+PARAMETER_SCOPE = "student"
+
+# 'compat':  Mersenne Twister seeded per student, consuming draws in the
+#            order generate_parameters() makes them (the lab01 values).
+# 'counter': each parameter in PARAMETER_SPEC is derived from its own
+#            hash(seed, parameter name), so adding or reordering parameters
+#            leaves the others unchanged and no RNG state is allocated.
+RNG_MODE = "compat"
+
+# Parameter definitions for RNG_MODE = 'counter' (same ranges as generate_parameters):
+#   ('int', low, high)                 inclusive integer range
+#   ('uniform', low, high, decimals)   rounded float
+#   ('choice', options)
+PARAMETER_SPEC = {
+    'sample_depth': ('int', 150, 450),
+    'sample_mass': ('uniform', 10.0, 25.0, 1),
+    'sample_volume': ('uniform', 3.0, 8.0, 1),
+    'rock_type': ('choice', ('Granite', 'Basalt', 'Sandstone', 'Schist', 'Gneiss')),
+    'grade_value': ('uniform', 0.5, 4.5, 2),
+}
+
+# Number of variants memoized in-process by get_variant_for_student()
+VARIANT_CACHE_SIZE = 4096
+
 
 # ============================================================================
 # VARIANT COMPUTATION (Deterministic)
@@ -50,6 +93,13 @@ def compute_group(seed: int) -> int:
     return seed % NUM_GROUPS
 
 
+def compute_group_seed(group_id: int) -> int:
+    """Compute the shared parameter seed for a variant group."""
+    combined = f"{ASSIGNMENT_ID}:{SEED_SALT}:group:{group_id}"
+    hash_bytes = hashlib.sha256(combined.encode()).digest()
+    return int.from_bytes(hash_bytes[:8], byteorder='big')
+
+
 def generate_parameters(rng, group_id):
     """Generate Lab 1 specific parameters deterministically."""
     return {
@@ -61,24 +111,57 @@ def generate_parameters(rng, group_id):
     }
 
 
-def get_variant_for_student(student_id: str) -> Dict[str, Any]:
+def _counter_value(seed: int, name: str, spec: tuple) -> Any:
+    """One parameter value from a 64-bit hash of (seed, parameter name)."""
+    digest = hashlib.blake2b(f"{seed}:{name}".encode(), digest_size=8).digest()
+    x = int.from_bytes(digest, byteorder='big')
+    kind = spec[0]
+    if kind == 'int':
+        low, high = spec[1], spec[2]
+        return low + ((x * (high - low + 1)) >> 64)
+    if kind == 'uniform':
+        low, high, decimals = spec[1], spec[2], spec[3]
+        return round(low + (high - low) * ((x >> 11) / 2**53), decimals)
+    if kind == 'choice':
+        options = spec[1]
+        return options[(x * len(options)) >> 64]
+    raise ValueError(f"Unknown parameter kind {kind!r} for {name!r}")
+
+
+def counter_parameters(seed: int) -> Dict[str, Any]:
+    """Parameters for RNG_MODE = 'counter': each one independent of the others."""
+    return {name: _counter_value(seed, name, spec) for name, spec in PARAMETER_SPEC.items()}
+
+
+def parameters_for_seed(seed: int, group_id: Optional[int],
+                        rng: Optional[random.Random] = None) -> Dict[str, Any]:
     """
-    Compute the variant for a given student ID.
+    Parameters for a parameter seed in the configured RNG_MODE.
     
-    Args:
-        student_id: Student's GitHub username or identifier
-        
-    Returns:
-        Dict with student_id, variant_seed, group_id, and parameters
+    In 'compat' mode `rng` (if given) is reseeded and reused, which is
+    equivalent to random.Random(seed).
     """
+    if RNG_MODE == 'counter':
+        return counter_parameters(seed)
+    if rng is None:
+        rng = random.Random(seed)
+    else:
+        rng.seed(seed)
+    return generate_parameters(rng, group_id)
+
+
+def _build_variant(student_id: str, rng: random.Random) -> Dict[str, Any]:
+    """Compute a variant, reseeding the given Random instance in place."""
     seed = compute_seed(student_id)
     group_id = compute_group(seed) if VARIANT_STRATEGY != 'unique' else None
     
-    # Create seeded random instance for reproducibility
-    rng = random.Random(seed)
+    if PARAMETER_SCOPE == 'group' and group_id is not None:
+        parameter_seed = compute_group_seed(group_id)
+    else:
+        parameter_seed = seed
     
     # Generate parameters
-    parameters = generate_parameters(rng, group_id)
+    parameters = parameters_for_seed(parameter_seed, group_id, rng)
     
     return {
         'student_id': student_id,
@@ -88,29 +171,450 @@ def get_variant_for_student(student_id: str) -> Dict[str, Any]:
     }
 
 
+@functools.lru_cache(maxsize=VARIANT_CACHE_SIZE)
+def _cached_variant(student_id: str, config: tuple) -> Dict[str, Any]:
+    """Memoized variant; the configuration is part of the key so changes invalidate it."""
+    return _build_variant(student_id, random.Random())
+
+
+def _config_key() -> tuple:
+    """Everything besides the student ID that determines a variant."""
+    return (ASSIGNMENT_ID, SEED_SALT, VARIANT_STRATEGY, NUM_GROUPS, PARAMETER_SCOPE,
+            generate_parameters, RNG_MODE, tuple(PARAMETER_SPEC.items()))
+
+
+def get_variant_for_student(student_id: str) -> Dict[str, Any]:
+    """
+    Compute the variant for a given student ID.
+    
+    Results are memoized (LRU) per configuration, so repeated lookups are
+    cheap; each call still returns a fresh dict the caller may modify.
+    
+    Args:
+        student_id: Student's GitHub username or identifier
+        
+    Returns:
+        Dict with student_id, variant_seed, group_id, and parameters
+    """
+    variant = _cached_variant(student_id, _config_key())
+    return {**variant, 'parameters': dict(variant['parameters'])}
+
+
+# ============================================================================
+# PERSISTENT CACHE (optional, for hidden-test and bulk runners)
+# ============================================================================
+
+def config_fingerprint() -> str:
+    """
+    Hash of everything that determines variant values.
+    
+    Covers SEED_SALT, ASSIGNMENT_ID, VARIANT_STRATEGY, NUM_GROUPS,
+    PARAMETER_SCOPE and the source of generate_parameters, so any change invalidates cached variants.
+    In 'counter' mode RNG_MODE and PARAMETER_SPEC are covered instead of the generator source.
+    """
+    import inspect
+    try:
+        generator_source = inspect.getsource(generate_parameters)
+    except (OSError, TypeError):
+        code = generate_parameters.__code__
+        generator_source = code.co_code.hex() + repr(code.co_consts)
+    if RNG_MODE != 'compat':
+        generator_source = f"{RNG_MODE}:{sorted(PARAMETER_SPEC.items())!r}"
+    combined = (f"{ASSIGNMENT_ID}:{SEED_SALT}:{VARIANT_STRATEGY}:{NUM_GROUPS}:"
+                f"{PARAMETER_SCOPE}:{generator_source}")
+    return hashlib.sha256(combined.encode()).hexdigest()
+
+
+class VariantCache:
+    """
+    JSON-backed variant cache that survives between runs.
+    
+    The file stores the config fingerprint next to the variants; a file
+    written under a different configuration is ignored and rebuilt.
+    
+    Usage:
+        with VariantCache('.variant_cache.json') as cache:
+            variant = cache.get('student123')
+    """
+    
+    def __init__(self, path: str):
+        import json
+        from pathlib import Path
+        self.path = Path(path)
+        self.fingerprint = config_fingerprint()
+        self.variants: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('fingerprint') == self.fingerprint:
+            self.variants = data.get('variants', {})
+    
+    def get(self, student_id: str) -> Dict[str, Any]:
+        """Return the variant for a student, computing and storing it if needed."""
+        variant = self.variants.get(student_id)
+        if variant is None:
+            variant = get_variant_for_student(student_id)
+            self.variants[student_id] = variant
+            self.dirty = True
+        return {**variant, 'parameters': dict(variant['parameters'])}
+    
+    def save(self) -> None:
+        """Write the cache atomically if anything changed."""
+        if not self.dirty:
+            return
+        import json
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': self.fingerprint, 'variants': self.variants},
+                      f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+    
+    def __enter__(self) -> 'VariantCache':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.save()
+
+
+# ============================================================================
+# BATCH COMPUTATION (whole-cohort rosters)
+# ============================================================================
+
+ROSTER_ID_FIELDS = ('student_id', 'username', 'github_username', 'github', 'login', 'id')
+
+
+def _roster_field(name: str) -> str:
+    """Header cell or JSON key in ROSTER_ID_FIELDS form ('Student ID' -> 'student_id')."""
+    return '_'.join(name.strip().lower().replace('-', ' ').split())
+
+
+def _roster_format(path: str, lines: List[str]) -> str:
+    """
+    'jsonl' or 'csv' for a roster: from the file suffix, or for stdin from
+    the first non-blank line (a JSON string or object starts with '"' or '{').
+    """
+    if path != '-':
+        return 'jsonl' if os.path.splitext(path)[1].lower() in ('.jsonl', '.ndjson') else 'csv'
+    for line in sys.stdin:
+        lines.append(line)
+        if line.strip():
+            return 'jsonl' if line.lstrip()[0] in '{"' else 'csv'
+    return 'csv'
+
+
+def _variants_for_chunk(student_ids: List[str]) -> List[Dict[str, Any]]:
+    """Compute a chunk of variants with one shared Random instance."""
+    rng = random.Random()
+    return [_build_variant(student_id, rng) for student_id in student_ids]
+
+
+def _picklable_chunk_task():
+    """
+    Return _variants_for_chunk in a form worker processes can import.
+    
+    pickle looks functions up as sys.modules[__name__].<name>. When this file
+    was loaded with spec_from_file_location but never registered (as the
+    workflow does), a module exposing this module's own globals is
+    registered under its name. Nothing is re-executed, so there is still a
+    single copy of every function and of the variant cache. A module that
+    is already registered is never replaced; if it is a separate copy of
+    this file, its identical _variants_for_chunk is used.
+    """
+    module = sys.modules.get(__name__)
+    if module is None:
+        import types
+        module = types.ModuleType(__name__, __doc__)
+        module.__dict__.update(globals())
+        sys.modules[__name__] = module
+    return module._variants_for_chunk
+
+
+def get_variants_for_students(student_ids: Iterable[str], workers: int = 1,
+                              chunksize: int = 1000) -> Iterator[Dict[str, Any]]:
+    """
+    Compute variants for many students, yielding them in input order.
+    
+    Results are identical to calling get_variant_for_student() per ID.
+    The input is consumed lazily in chunks, so memory stays flat for
+    arbitrarily large rosters.
+    
+    Args:
+        student_ids: Iterable of student identifiers
+        workers: Number of worker processes (1 = compute in this process)
+        chunksize: Number of IDs handed to a worker at a time
+        
+    Yields:
+        Variant dicts, as returned by get_variant_for_student()
+    """
+    ids = iter(student_ids)
+    chunks = iter(lambda: list(itertools.islice(ids, chunksize)), [])
+    
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _variants_for_chunk(chunk)
+        return
+    
+    from concurrent.futures import ProcessPoolExecutor
+    
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
+    
+    task = _picklable_chunk_task()
+    # Keep a bounded window of chunks in flight instead of Executor.map,
+    # which would submit the whole (possibly huge) roster up front.
+    with ProcessPoolExecutor(max_workers=workers, initializer=sys.path.insert,
+                             initargs=(0, scripts_dir)) as pool:
+        window = workers * 2
+        while True:
+            batch = list(itertools.islice(chunks, window))
+            if not batch:
+                break
+            for result in pool.map(task, batch):
+                yield from result
+
+
+def read_roster(path: str, fmt: Optional[str] = None,
+                header: Optional[bool] = None) -> Iterator[str]:
+    """
+    Stream student IDs from a CSV or JSONL roster file ('-' for stdin).
+    
+    JSONL lines may be plain strings or objects with a 'student_id'
+    (or 'username', 'github_username', ...) field. CSV files use the first
+    matching header column; header cells are compared case-insensitively
+    with spaces and hyphens read as '_', so 'Student ID' or 'GitHub
+    Username' work. A roster without a header must have a single column of
+    IDs; its first cell is taken as a header instead when it contains
+    whitespace, which no username does.
+    
+    Args:
+        path: Roster file, or '-' for stdin
+        fmt: 'csv' or 'jsonl' (default: from the suffix; stdin is sniffed)
+        header: Whether the first CSV row is a header (default: detect)
+    
+    Raises:
+        ValueError: A JSONL object has none of the ROSTER_ID_FIELDS, or the
+            first CSV row has several columns and none of them is an ID field
+    """
+    import csv
+    import json
+    
+    peeked: List[str] = []
+    fmt = fmt or _roster_format(path, peeked)
+    if path == '-':
+        handle = itertools.chain(peeked, sys.stdin)
+    else:
+        handle = open(path, newline='', encoding='utf-8')
+    try:
+        if fmt == 'jsonl':
+            for line_number, line in enumerate(handle, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if isinstance(record, dict):
+                    fields = {_roster_field(key): value for key, value in record.items()}
+                    field = next((f for f in ROSTER_ID_FIELDS if f in fields), None)
+                    if field is None:
+                        raise ValueError(f'{path}:{line_number}: roster record has no '
+                                         f'student ID field (one of {", ".join(ROSTER_ID_FIELDS)})')
+                    record = fields[field]
+                yield str(record).strip()
+            return
+        
+        rows = csv.reader(handle)
+        column = 0
+        for row in rows:
+            if not row:
+                continue
+            if header is False:
+                yield row[0].strip()
+                break
+            cells = [_roster_field(cell) for cell in row]
+            for field in ROSTER_ID_FIELDS:
+                if field in cells:
+                    column = cells.index(field)
+                    break
+            else:
+                if len(row) > 1:
+                    raise ValueError(f'{path}: no student ID column in header {row} '
+                                     f'(expected one of {", ".join(ROSTER_ID_FIELDS)})')
+                if header is None and len(row[0].split()) == 1:
+                    # No header row: the first row is already a student
+                    yield row[0].strip()
+            break
+        for row in rows:
+            if len(row) > column and row[column].strip():
+                yield row[column].strip()
+    finally:
+        if path != '-':
+            handle.close()
+
+
+def write_variants(variants: Iterable[Dict[str, Any]], out: TextIO, fmt: str = 'jsonl') -> int:
+    """
+    Stream variants to a file object as JSONL or flat CSV.
+    
+    Returns:
+        Number of variants written
+    """
+    count = 0
+    if fmt == 'csv':
+        import csv
+        writer = None
+        for variant in variants:
+            params = variant['parameters']
+            if writer is None:
+                writer = csv.writer(out)
+                writer.writerow(['student_id', 'variant_seed', 'group_id', *params])
+            writer.writerow([variant['student_id'], variant['variant_seed'],
+                             variant['group_id'], *params.values()])
+            count += 1
+        return count
+    
+    import json
+    
+    for variant in variants:
+        out.write(json.dumps(variant, separators=(',', ':')))
+        out.write('\n')
+        count += 1
+    return count
+
+
+def read_variants(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily read variants written by write_variants() in JSONL format.
+    
+    A single-variant file such as .variant_config.json is one line, so
+    callers that need only the first variant read just that line. Older
+    indented (multi-line) JSON files are still accepted.
+    """
+    import json
+    
+    with open(path, encoding='utf-8') as f:
+        first = f.readline()
+        try:
+            variant = json.loads(first)
+        except ValueError:
+            # Not line-delimited: a pretty-printed JSON document
+            f.seek(0)
+            yield json.load(f)
+            return
+        yield variant
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
 # ============================================================================
 # STUDENT IDENTIFICATION
 # ============================================================================
 
-def get_repo_name() -> Optional[str]:
-    """Get the repository name from git or environment."""
-    github_repo = os.environ.get('GITHUB_REPOSITORY')
+def find_git_dir(start: Optional[Path] = None) -> Optional[Path]:
+    """
+    Locate the git directory for `start` (default: cwd) without running git.
+    
+    Walks up to the enclosing repository and follows `.git` files of the
+    form `gitdir: <path>` used by worktrees and submodules.
+    """
+    from pathlib import Path
+    
+    path = Path(start or Path.cwd()).resolve()
+    for directory in (path, *path.parents):
+        dot_git = directory / '.git'
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            try:
+                content = dot_git.read_text(encoding='utf-8').strip()
+            except OSError:
+                return None
+            if not content.startswith('gitdir:'):
+                return None
+            git_dir = Path(content[len('gitdir:'):].strip())
+            if not git_dir.is_absolute():
+                git_dir = directory / git_dir
+            return git_dir.resolve()
+    return None
+
+
+def _common_git_dir(git_dir: Path) -> Path:
+    """Worktree git dirs keep the shared config in the dir named by `commondir`."""
+    from pathlib import Path
+    
+    try:
+        common = Path((git_dir / 'commondir').read_text(encoding='utf-8').strip())
+    except OSError:
+        return git_dir
+    if not common.is_absolute():
+        common = git_dir / common
+    return common.resolve()
+
+
+def read_remote_url(git_dir: Path, remote: str = 'origin') -> Optional[str]:
+    """Read a remote's URL straight from the repository's config file."""
+    try:
+        lines = (_common_git_dir(git_dir) / 'config').read_text(encoding='utf-8').splitlines()
+    except OSError:
+        return None
+    
+    wanted = (f'remote "{remote}"', f'remote.{remote}')
+    in_remote = False
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] in '#;':
+            continue
+        if line.startswith('['):
+            header = line[1:line.find(']')].strip()
+            name, _, subsection = header.partition(' ')
+            in_remote = f'{name.lower()} {subsection.strip()}' in wanted or header.lower() in wanted
+            continue
+        if in_remote:
+            key, sep, value = line.partition('=')
+            if sep and key.strip().lower() == 'url':
+                return value.strip().strip('"')
+    return None
+
+
+def repo_name_from_url(url: str) -> str:
+    """Return the repository name from a remote URL (https, ssh or scp-style)."""
+    url = url.strip().rstrip('/')
+    url = url.removesuffix('.git')
+    return url.replace(':', '/').split('/')[-1]
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_repo_name(github_repo: Optional[str], cwd: str) -> Optional[str]:
+    """Resolve the repository name once per (GITHUB_REPOSITORY, cwd)."""
     if github_repo:
         return github_repo.split('/')[-1]
     
+    git_dir = find_git_dir(cwd)
+    url = read_remote_url(git_dir) if git_dir else None
+    if url:
+        return repo_name_from_url(url)
+    
+    # Fall back to asking git, e.g. for config layouts the reader skips
+    import subprocess
+    
     try:
         result = subprocess.run(
             ['git', 'remote', 'get-url', 'origin'],
-            capture_output=True, text=True, timeout=5
+            capture_output=True, text=True, timeout=5, cwd=cwd
         )
-        if result.returncode == 0:
-            url = result.stdout.strip()
-            repo = url.rstrip('.git').split('/')[-1]
-            return repo
+        if result.returncode == 0 and result.stdout.strip():
+            return repo_name_from_url(result.stdout)
     except (subprocess.TimeoutExpired, FileNotFoundError):
         pass
     
-    return Path.cwd().name
+    return os.path.basename(cwd.rstrip(os.sep)) or cwd
+
+
+def get_repo_name() -> Optional[str]:
+    """Get the repository name from the environment or the git config."""
+    return _resolve_repo_name(os.environ.get('GITHUB_REPOSITORY'), os.getcwd())
 
 
 def extract_username_from_repo(repo_name: str) -> str:
@@ -131,9 +635,19 @@ def get_my_username() -> str:
     return "unknown"
 
 
-def get_my_variant() -> Dict[str, Any]:
-    """Get the variant for the current student (auto-detected from repo name)."""
+def get_my_variant(cache_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get the variant for the current student (auto-detected from repo name).
+    
+    Args:
+        cache_path: Optional persistent VariantCache file. Defaults to the
+            VARIANT_CACHE_FILE environment variable; no file cache if unset.
+    """
     username = get_my_username()
+    cache_path = cache_path or os.environ.get('VARIANT_CACHE_FILE')
+    if cache_path:
+        with VariantCache(cache_path) as cache:
+            return cache.get(username)
     return get_variant_for_student(username)
 
 
@@ -165,9 +679,64 @@ def print_assignment_values():
     print("These values are UNIQUE to you. Using someone else's")
     print("values will cause hidden tests to FAIL.")
     print()
+    import json
+    
     print("JSON format (for reference):")
     print(json.dumps(variant, indent=2))
 
 
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    if argv is None:
+        argv = sys.argv[1:]
+    if not argv:
+        # The common student case: skip argparse entirely
+        print_assignment_values()
+        return 0
+    
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='Show your Lab 1 values, or export variants for a whole roster.')
+    parser.add_argument('--json', action='store_true',
+                        help='Print your variant as one line of compact JSON')
+    parser.add_argument('--roster', metavar='FILE',
+                        help="CSV or JSONL roster of student IDs ('-' for stdin)")
+    parser.add_argument('--format', choices=('jsonl', 'csv'),
+                        help='Roster output format (default: from --output suffix, else jsonl)')
+    parser.add_argument('--output', metavar='FILE', default='-',
+                        help="Output file for --json or --roster (default: stdout)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for roster mode (default: 1)')
+    args = parser.parse_args(argv)
+    
+    if args.json and not args.roster:
+        variant = get_my_variant()
+        if args.output == '-':
+            write_variants([variant], sys.stdout)
+        else:
+            with open(args.output, 'w', encoding='utf-8') as out:
+                write_variants([variant], out)
+            print("Generated variant for {student} (group {group}) in {repo}".format(
+                student=variant['student_id'],
+                group=variant['group_id'],
+                repo=os.environ.get('GITHUB_REPOSITORY', 'local'),
+            ))
+        return 0
+    
+    if not args.roster:
+        print_assignment_values()
+        return 0
+    
+    fmt = args.format or ('csv' if args.output.lower().endswith('.csv') else 'jsonl')
+    variants = get_variants_for_students(read_roster(args.roster), workers=args.workers)
+    if args.output == '-':
+        write_variants(variants, sys.stdout, fmt)
+    else:
+        with open(args.output, 'w', newline='', encoding='utf-8') as out:
+            write_variants(variants, out, fmt)
+    return 0
+
+
 if __name__ == "__main__":
-    print_assignment_values()
+    sys.exit(main())
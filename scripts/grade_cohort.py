@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Parallel Cohort Grading for GGY3061 Lab 1
+
+Runs the Lab 1 visible checks against a directory of checked-out student
+submissions, one repository per worker process, and writes a single
+aggregated report. Scores use the same formula as the "Calculate Score"
+step in .github/workflows/autograding.yml (passed / total * 40).
+
+The checks are the test classes in tests/visible/test_lab1.py of THIS
+repository (not the copies inside each submission), executed directly
+against each submission's src/ folder without starting pytest.
+
+Usage:
+    python scripts/grade_cohort.py submissions/ --output report.json --csv report.csv
+    python scripts/grade_cohort.py submissions/ --workers 8 --runner inprocess
+    python scripts/grade_cohort.py submissions/ --backend async --concurrency 64
+"""
+
+import argparse
+import csv
+import importlib.util
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+TESTS_DIR = REPO_ROOT / 'tests' / 'visible'
+SCRIPTS_DIR = REPO_ROOT / 'scripts'
+
+# Must match the "Calculate Score" step of the autograding workflow
+VISIBLE_POINTS = 40
+
+
+# ============================================================================
+# MODULE LOADING
+# ============================================================================
+
+def load_module(name: str, path: Path):
+    """Import a module from a file path (as the autograding workflow does)."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_test_module():
+    """Load tests/visible/test_lab1.py with its harness importable."""
+    if str(TESTS_DIR) not in sys.path:
+        sys.path.insert(0, str(TESTS_DIR))
+    return load_module('test_lab1', TESTS_DIR / 'test_lab1.py')
+
+
+def load_variant_module():
+    """Load scripts/get_variant.py."""
+    return load_module('get_variant', SCRIPTS_DIR / 'get_variant.py')
+
+
+# ============================================================================
+# RUNNING THE CHECKS
+# ============================================================================
+
+def collect_tests(test_module) -> List[tuple]:
+    """Return (nodeid, class, method name) for every visible test, in file order."""
+    tests = []
+    for class_name, cls in vars(test_module).items():
+        if not (class_name.startswith('Test') and isinstance(cls, type)):
+            continue
+        for name, member in vars(cls).items():
+            if name.startswith('test_') and callable(member):
+                tests.append((f'test_lab1.py::{class_name}::{name}', cls, name))
+    return tests
+
+
+def run_checks(test_module, src_dir: Path) -> List[Dict[str, Any]]:
+    """Run every visible test against one submission's src/ directory."""
+    test_module.SRC_DIR = Path(src_dir)
+    results = []
+    for nodeid, cls, name in collect_tests(test_module):
+        outcome, message = 'passed', None
+        started = time.perf_counter()
+        try:
+            getattr(cls(), name)()
+        except AssertionError as exc:
+            outcome, message = 'failed', str(exc).splitlines()[0] if str(exc) else 'AssertionError'
+        except Exception as exc:
+            # pytest reports exceptions in a test body as failures as well
+            outcome, message = 'failed', f'{type(exc).__name__}: {exc}'
+        results.append({'nodeid': nodeid, 'outcome': outcome, 'message': message,
+                        'duration': round(time.perf_counter() - started, 6)})
+    return results
+
+
+def visible_score(passed: int, total: int) -> float:
+    """Visible-test score, identical to the workflow's formula."""
+    return (passed / total * VISIBLE_POINTS) if total > 0 else 0
+
+
+def grade_repository(repo_path: str, variant: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Grade one checked-out submission.
+
+    Args:
+        repo_path: Path to the student's repository checkout
+        variant: Precomputed variant for the student (computed if omitted)
+
+    Returns:
+        Dict with repo, student_id, group_id, summary, score and tests
+    """
+    repo_path = Path(repo_path)
+    get_variant = load_variant_module()
+    student_id = get_variant.extract_username_from_repo(repo_path.name)
+    if variant is None:
+        variant = get_variant.get_variant_for_student(student_id)
+
+    test_module = load_test_module()
+    timings = sys.modules['harness'].TIMINGS
+    first_timing = len(timings)
+    started = time.perf_counter()
+    tests = run_checks(test_module, repo_path / 'src')
+    duration = time.perf_counter() - started
+    passed = sum(1 for t in tests if t['outcome'] == 'passed')
+    total = len(tests)
+    return {
+        'repo': repo_path.name,
+        'student_id': student_id,
+        'group_id': variant['group_id'],
+        'summary': {'passed': passed, 'failed': total - passed, 'total': total},
+        'score': visible_score(passed, total),
+        'duration': round(duration, 6),
+        'scripts': timings[first_timing:],
+        'tests': tests,
+    }
+
+
+def _grade_job(job: tuple) -> Dict[str, Any]:
+    """Process-pool entry point: (repo path, variant) -> report entry."""
+    return grade_repository(*job)
+
+
+def _init_worker(runner: str) -> None:
+    """Load the test modules once per worker and select the script runner."""
+    load_test_module()
+    load_variant_module()
+    sys.modules['harness'].set_runner(runner)
+
+
+def _grade_async(jobs: List[tuple], concurrency: int) -> List[Dict[str, Any]]:
+    """Prefetch all script runs concurrently, then grade from the run cache."""
+    test_module = load_test_module()
+    harness = sys.modules['harness']
+    harness.set_runner('subprocess')
+    first_timing = len(harness.TIMINGS)
+    harness.prefetch(
+        [job for repo, _ in jobs for job in harness.suite_jobs(test_module, Path(repo) / 'src')],
+        concurrency=concurrency,
+    )
+    timings_by_src: Dict[str, List[Dict[str, Any]]] = {}
+    for timing in harness.TIMINGS[first_timing:]:
+        timings_by_src.setdefault(str(Path(timing['path']).parent), []).append(timing)
+
+    entries = []
+    for repo, variant in jobs:
+        entry = grade_repository(repo, variant)
+        entry['scripts'] = timings_by_src.get(str(Path(repo) / 'src'), [])
+        entries.append(entry)
+    return entries
+
+
+def available_cores() -> int:
+    """Number of cores this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def find_submissions(submissions_dir: Path) -> List[Path]:
+    """Every non-hidden subdirectory is treated as one student checkout."""
+    return sorted(p for p in Path(submissions_dir).iterdir()
+                  if p.is_dir() and not p.name.startswith('.'))
+
+
+def grade_cohort(submissions_dir: str, workers: Optional[int] = None,
+                 runner: str = 'subprocess', backend: str = 'process',
+                 concurrency: int = 32) -> Dict[str, Any]:
+    """
+    Grade every submission under a directory.
+
+    The 'process' backend grades one repository per pool worker. The
+    'async' backend runs every student script of every repository on one
+    event loop (at most `concurrency` at a time), then evaluates the
+    checks against the cached results.
+
+    Args:
+        submissions_dir: Directory containing one checkout per student
+        workers: Worker processes (default: number of available cores)
+        runner: Harness execution mode ('subprocess', 'inprocess' or 'pool')
+        backend: 'process' or 'async'
+        concurrency: Maximum student processes in flight (async backend)
+
+    Returns:
+        Aggregated report dict
+    """
+    get_variant = load_variant_module()
+    repos = find_submissions(Path(submissions_dir))
+    students = [get_variant.extract_username_from_repo(repo.name) for repo in repos]
+    # One variant computation per student, shared with the workers
+    variants = get_variant.get_variants_for_students(students)
+    jobs = [(str(repo), variant) for repo, variant in zip(repos, variants)]
+
+    workers = workers or available_cores()
+    if backend == 'async':
+        entries = _grade_async(jobs, concurrency)
+    elif workers <= 1:
+        _init_worker(runner)
+        entries = [_grade_job(job) for job in jobs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(runner,)) as pool:
+            entries = list(pool.map(_grade_job, jobs))
+
+    return {
+        'assignment_id': get_variant.ASSIGNMENT_ID,
+        'visible_points': VISIBLE_POINTS,
+        'repos': entries,
+        'timing_summary': timing_summary(entries),
+    }
+
+
+def timing_summary(entries: List[Dict[str, Any]], n: int = 10) -> Dict[str, Any]:
+    """Slowest script executions and repositories, plus timeout counts."""
+    scripts = [dict(timing, repo=entry['repo']) for entry in entries for timing in entry['scripts']]
+    slowest_scripts = sorted(scripts, key=lambda t: t['wall_time'], reverse=True)[:n]
+    slowest_repos = sorted(entries, key=lambda e: e['duration'], reverse=True)[:n]
+    return {
+        'script_runs': len(scripts),
+        'timeouts': sum(1 for t in scripts if t['timed_out']),
+        'slowest_scripts': [
+            {key: t[key] for key in ('repo', 'script', 'wall_time', 'cpu_time',
+                                     'peak_rss_kb', 'timed_out')}
+            for t in slowest_scripts
+        ],
+        'slowest_repos': [{'repo': e['repo'], 'duration': e['duration']} for e in slowest_repos],
+    }
+
+
+# ============================================================================
+# REPORTS
+# ============================================================================
+
+def write_csv_report(report: Dict[str, Any], path: str) -> None:
+    """Write one row per repository."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['repo', 'student_id', 'group_id', 'passed', 'total', 'score'])
+        for entry in report['repos']:
+            summary = entry['summary']
+            writer.writerow([entry['repo'], entry['student_id'], entry['group_id'],
+                             summary['passed'], summary['total'], f"{entry['score']:.1f}"])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Grade a directory of Lab 1 submissions.')
+    parser.add_argument('submissions', help='Directory with one checkout per student')
+    parser.add_argument('--output', metavar='FILE', default='-',
+                        help='JSON report path (default: stdout)')
+    parser.add_argument('--csv', metavar='FILE', help='Also write a CSV summary')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: all cores)')
+    parser.add_argument('--runner', choices=('subprocess', 'inprocess', 'pool'),
+                        default='subprocess',
+                        help='How student scripts are executed (default: subprocess)')
+    parser.add_argument('--backend', choices=('process', 'async'), default='process',
+                        help='process: one repo per pool worker; async: all scripts on '
+                             'one event loop (default: process)')
+    parser.add_argument('--concurrency', type=int, default=32,
+                        help='Student processes in flight for --backend async (default: 32)')
+    args = parser.parse_args(argv)
+
+    report = grade_cohort(args.submissions, workers=args.workers, runner=args.runner,
+                          backend=args.backend, concurrency=args.concurrency)
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.csv:
+        write_csv_report(report, args.csv)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
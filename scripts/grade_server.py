@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Local Grading Daemon for GGY3061 Lab 1
+
+Keeps the visible test module and the variant generator loaded (and, with
+--runner pool, a warm pool of sandboxed worker interpreters), and grades
+checkouts on request over HTTP on the loopback interface. Each job returns the same per-repository
+JSON as grade_cohort.py (summary, score, tests), so a re-grade costs the
+checks themselves instead of Python start-up, pip and pytest collection.
+
+Script results stay cached by content hash between jobs, so re-grading an
+unchanged checkout is a cache hit.
+
+The daemon has no authentication and grades any path it is sent, so it
+only binds loopback addresses unless --allow-remote is given.
+
+Student scripts run in a fresh interpreter each (--runner subprocess) by
+default, so nothing one submission changes can affect the next one graded.
+
+Usage:
+    python scripts/grade_server.py --port 8765
+    curl -s -X POST localhost:8765/grade -d '{"repo": "submissions/ggy3061-lab01-ada"}'
+    curl -s localhost:8765/health
+"""
+
+import argparse
+import ipaddress
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import grade_cohort  # noqa: E402
+
+DEFAULT_PORT = 8765
+
+# Cached script runs kept between jobs before the harness caches are reset
+MAX_CACHED_RUNS = 20000
+
+
+class GradingService:
+    """
+    Warm grading state shared by all requests.
+
+    The harness keeps module-level state (runner, caches, the patched
+    SRC_DIR), so jobs are graded one at a time under a lock.
+    """
+
+    def __init__(self, runner: str = 'subprocess'):
+        grade_cohort.load_test_module()
+        self.get_variant = grade_cohort.load_variant_module()
+        self.harness = sys.modules['harness']
+        self.harness.set_runner(runner)
+        if runner == self.harness.RUNNER_POOL:
+            self.harness.get_pool()  # start the workers now, not on the first job
+        self.runner = runner
+        self.started = time.time()
+        self.graded = 0
+        self._lock = threading.Lock()
+
+    def grade(self, repo_path: str) -> Dict[str, Any]:
+        """Grade one checkout; same entry as grade_cohort.grade_repository()."""
+        with self._lock:
+            entry = grade_cohort.grade_repository(repo_path)
+            self.graded += 1
+            self._trim_caches()
+        return entry
+
+    def _trim_caches(self) -> None:
+        """Bound the daemon's memory: TIMINGS per job, run caches by size."""
+        harness = self.harness
+        del harness.TIMINGS[:]
+        if len(harness._RUN_CACHE) > MAX_CACHED_RUNS:
+            for cache in (harness._RUN_CACHE, harness._OUTPUT_CACHE,
+                          harness._CODE_CACHE, harness._STATIC_CACHE):
+                cache.clear()
+
+    def health(self) -> Dict[str, Any]:
+        """Liveness and counters."""
+        return {
+            'status': 'ok',
+            'runner': self.runner,
+            'graded': self.graded,
+            'uptime': round(time.time() - self.started, 3),
+            'assignment_id': self.get_variant.ASSIGNMENT_ID,
+        }
+
+
+class GradingHandler(BaseHTTPRequestHandler):
+    """POST /grade {"repo": path} -> report entry; GET /health."""
+
+    service: GradingService = None
+
+    def _send(self, status: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        if self.path == '/health':
+            self._send(200, self.service.health())
+        else:
+            self._send(404, {'error': f'unknown path {self.path}'})
+
+    def do_POST(self) -> None:
+        if self.path != '/grade':
+            self._send(404, {'error': f'unknown path {self.path}'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            job = json.loads(self.rfile.read(length) or b'{}')
+            repo = Path(job['repo'])
+        except (ValueError, KeyError, TypeError):
+            self._send(400, {'error': 'expected a JSON body like {"repo": "path/to/checkout"}'})
+            return
+        if not repo.is_dir():
+            self._send(404, {'error': f'no such checkout: {repo}'})
+            return
+        try:
+            entry = self.service.grade(str(repo))
+        except Exception as exc:
+            self._send(500, {'error': f'grading {repo} failed: {type(exc).__name__}: {exc}'})
+            return
+        self._send(200, entry)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Quiet by default; the daemon is meant to run unattended."""
+
+
+def is_loopback(host: str) -> bool:
+    """True for 'localhost' and loopback IP addresses."""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def make_server(service: GradingService, host: str = '127.0.0.1',
+                port: int = DEFAULT_PORT, allow_remote: bool = False) -> ThreadingHTTPServer:
+    """
+    HTTP server bound to host:port (port 0 picks a free port).
+
+    Raises:
+        ValueError: host is not a loopback address and allow_remote is False
+    """
+    if not allow_remote and not is_loopback(host):
+        raise ValueError(f'refusing to serve on non-loopback host {host!r} '
+                         f'without allow_remote (the daemon has no authentication)')
+    handler = type('BoundGradingHandler', (GradingHandler,), {'service': service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Local Lab 1 grading daemon.')
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Interface to bind (default: 127.0.0.1, local only)')
+    parser.add_argument('--allow-remote', action='store_true',
+                        help='Allow a non-loopback --host; anyone who can reach it can '
+                             'request grading, as there is no authentication')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f'Port (default: {DEFAULT_PORT})')
+    parser.add_argument('--runner', choices=('subprocess', 'inprocess', 'pool'),
+                        default='subprocess',
+                        help='How student scripts are executed (default: subprocess)')
+    args = parser.parse_args(argv)
+    if not args.allow_remote and not is_loopback(args.host):
+        parser.error(f'--host {args.host} is not a loopback address; '
+                     f'pass --allow-remote to serve it anyway')
+
+    server = make_server(GradingService(args.runner), args.host, args.port, args.allow_remote)
+    host, port = server.server_address[:2]
+    print(f'Grading Lab 1 submissions on http://{host}:{port} (POST /grade, GET /health)')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Columnar Results Store for GGY3061 Grading History
+
+Ingests pytest-json-report files (visible_results.json) into a compact,
+append-only store so a term's worth of runs can be analysed quickly.
+
+Layout of a store directory:
+    nodeids.txt   interned test IDs, one per line (line number = test index)
+    runs.jsonl    one line of metadata per run (repo, student, group, time)
+    run.u32       \\
+    test.u32       > one row per test result, as fixed-width native columns
+    outcome.u8    /
+
+The column files are plain arrays, readable with mmap without parsing.
+An ingest appends to runs.jsonl last, so a run exists once its line does:
+opening a store truncates column rows and partial lines of runs.jsonl and
+nodeids.txt left behind by an interrupted ingest.
+
+Usage:
+    python scripts/results_store.py ingest store/ visible_results.json --repo ggy3061-lab01-ada
+    python scripts/results_store.py query store/ --by test
+    python scripts/results_store.py query store/ --by group
+    python scripts/results_store.py query store/ --by task
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+OUTCOMES = ('passed', 'failed', 'error', 'skipped', 'xfailed', 'xpassed')
+OUTCOME_CODES = {name: code for code, name in enumerate(OUTCOMES)}
+PASSED = OUTCOME_CODES['passed']
+
+# Column file name -> array typecode
+COLUMNS = {'run.u32': 'I', 'test.u32': 'I', 'outcome.u8': 'B'}
+
+_TASK = re.compile(r'::TestTask(\d+)')
+
+
+def _complete_lines(path: Path) -> bytes:
+    """Contents of a line-oriented file, cutting off a partial last line left by a crash."""
+    if not path.exists():
+        return b''
+    with open(path, 'rb+') as f:
+        data = f.read()
+        complete = data.rfind(b'\n') + 1
+        if complete < len(data):
+            f.truncate(complete)  # interrupted append
+    return data[:complete]
+
+
+class ResultsStore:
+    """Append-only columnar store of test outcomes."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.nodeids: List[str] = []
+        self._nodeid_index: Dict[str, int] = {}
+        for nodeid in _complete_lines(self.path / 'nodeids.txt').decode('utf-8').splitlines():
+            self._nodeid_index[nodeid] = len(self.nodeids)
+            self.nodeids.append(nodeid)
+        self.num_runs = _complete_lines(self.path / 'runs.jsonl').count(b'\n')
+        self._drop_unrecorded_rows()
+
+    def _drop_unrecorded_rows(self) -> None:
+        """Truncate the columns to the rows of runs recorded in runs.jsonl."""
+        with self.column('run.u32') as runs:
+            rows = bisect_left(runs, self.num_runs)  # run indexes are appended in order
+        for name, code in COLUMNS.items():
+            path = self.path / name
+            size = rows * array(code).itemsize
+            if path.exists() and path.stat().st_size > size:
+                os.truncate(path, size)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _intern(self, nodeid: str, new_nodeids: List[str]) -> int:
+        """Return the index for a test ID, assigning a new one if unseen."""
+        index = self._nodeid_index.get(nodeid)
+        if index is None:
+            index = len(self.nodeids)
+            self._nodeid_index[nodeid] = index
+            self.nodeids.append(nodeid)
+            new_nodeids.append(nodeid)
+        return index
+
+    def ingest(self, report: Dict[str, Any], **metadata: Any) -> int:
+        """
+        Append one pytest-json-report document.
+
+        Args:
+            report: Parsed visible_results.json
+            **metadata: Stored with the run (e.g. repo, student_id, group_id)
+
+        Returns:
+            The new run's index
+        """
+        run_index = self.num_runs
+        new_nodeids: List[str] = []
+        columns = {name: array(code) for name, code in COLUMNS.items()}
+        for test in report.get('tests', []):
+            columns['run.u32'].append(run_index)
+            columns['test.u32'].append(self._intern(test['nodeid'], new_nodeids))
+            columns['outcome.u8'].append(OUTCOME_CODES.get(test['outcome'], OUTCOME_CODES['error']))
+
+        if new_nodeids:
+            with open(self.path / 'nodeids.txt', 'a', encoding='utf-8') as f:
+                f.write(''.join(f'{nodeid}\n' for nodeid in new_nodeids))
+        for name, values in columns.items():
+            with open(self.path / name, 'ab') as f:
+                values.tofile(f)
+        with open(self.path / 'runs.jsonl', 'a', encoding='utf-8') as f:
+            summary = report.get('summary', {})
+            record = {'created': report.get('created'),
+                      'passed': summary.get('passed', 0),
+                      'total': summary.get('total', 0), **metadata}
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+        self.num_runs += 1
+        return run_index
+
+    def ingest_file(self, report_path: str, **metadata: Any) -> int:
+        """Append a visible_results.json file."""
+        with open(report_path, encoding='utf-8') as f:
+            return self.ingest(json.load(f), **metadata)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def column(self, name: str) -> Iterator[memoryview]:
+        """
+        Memory-map a column file as a typed memoryview (empty if absent).
+
+        The map is closed when the with-block exits, so the view must not
+        be used (or kept) after it.
+        """
+        path = self.path / name
+        itemsize = array(COLUMNS[name]).itemsize
+        length = path.stat().st_size // itemsize * itemsize if path.exists() else 0
+        if not length:
+            yield memoryview(array(COLUMNS[name]))
+            return
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ)
+        raw = memoryview(mapped)
+        typed = raw.cast(COLUMNS[name])
+        try:
+            yield typed
+        finally:
+            typed.release()
+            raw.release()
+            mapped.close()
+
+    def runs(self) -> List[Dict[str, Any]]:
+        """Metadata of every run, in run index order."""
+        runs_file = self.path / 'runs.jsonl'
+        if not runs_file.exists():
+            return []
+        with open(runs_file, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def _pass_rates(self, key_for_row) -> Dict[Any, Dict[str, float]]:
+        """Aggregate pass counts over all rows grouped by key_for_row(run, test)."""
+        counts: Dict[Any, List[int]] = {}
+        with ExitStack() as stack:
+            runs, tests, outcomes = (stack.enter_context(self.column(name)) for name in COLUMNS)
+            for run, test, outcome in zip(runs, tests, outcomes):
+                entry = counts.setdefault(key_for_row(run, test), [0, 0])
+                entry[0] += outcome == PASSED
+                entry[1] += 1
+        return {key: {'passed': passed, 'total': total, 'pass_rate': passed / total}
+                for key, (passed, total) in sorted(counts.items(), key=lambda kv: str(kv[0]))}
+
+    def pass_rate_by_test(self) -> Dict[str, Dict[str, float]]:
+        """Pass rate per test ID across all runs."""
+        return self._pass_rates(lambda run, test: self.nodeids[test])
+
+    def pass_rate_by_group(self) -> Dict[Any, Dict[str, float]]:
+        """Pass rate per variant group (runs ingested with group_id metadata)."""
+        groups = [run.get('group_id') for run in self.runs()]
+        return self._pass_rates(lambda run, test: groups[run])
+
+    def pass_rate_by_task(self) -> Dict[str, Dict[str, float]]:
+        """Pass rate per lab task, from the TestTaskN class in each test ID."""
+        tasks = []
+        for nodeid in self.nodeids:
+            match = _TASK.search(nodeid)
+            tasks.append(f'Task {match.group(1)}' if match else 'other')
+        return self._pass_rates(lambda run, test: tasks[test])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Columnar store of grading results.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help='Append pytest-json-report files')
+    ingest.add_argument('store', help='Store directory')
+    ingest.add_argument('reports', nargs='+', help='visible_results.json files')
+    ingest.add_argument('--repo', help='Repository name to record with the run(s)')
+    ingest.add_argument('--student', help='Student ID to record with the run(s)')
+    ingest.add_argument('--group', type=int, help='Variant group to record with the run(s)')
+
+    query = commands.add_parser('query', help='Print pass rates')
+    query.add_argument('store', help='Store directory')
+    query.add_argument('--by', choices=('test', 'group', 'task'), default='test')
+
+    args = parser.parse_args(argv)
+    store = ResultsStore(args.store)
+
+    if args.command == 'ingest':
+        for report in args.reports:
+            store.ingest_file(report, repo=args.repo, student_id=args.student,
+                              group_id=args.group)
+        print(f'{store.num_runs} runs, {len(store.nodeids)} distinct tests in {args.store}')
+        return 0
+
+    rates = {
+        'test': store.pass_rate_by_test,
+        'group': store.pass_rate_by_group,
+        'task': store.pass_rate_by_task,
+    }[args.by]()
+    for key, rate in rates.items():
+        print(f"{str(key):70s} {rate['passed']:>7}/{rate['total']:<7} {rate['pass_rate']:6.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Cohort Similarity Checks for GGY3061 Lab 1 Submissions
+
+Two checks over a directory of student checkouts (one per subdirectory,
+named like the GitHub Classroom repos, e.g. ggy3061-lab01-ada):
+
+    Code similarity   Each submission's src/lab1_*.py is tokenized with
+                      `tokenize`, identifiers and numbers are normalized,
+                      and the k-token shingles of the starter code are
+                      removed, as are shingles found in more than
+                      MAX_SHINGLE_DF of the cohort: the canonical solution
+                      is short, and students who write it independently
+                      share it without copying. MinHash signatures bucketed
+                      with LSH give candidate pairs in near-linear time;
+                      candidates are confirmed with the exact Jaccard
+                      similarity.
+
+    Borrowed values   Literals in a submission are looked up in a
+                      VariantIndex (variant_index.py) of the cohort's
+                      get_variant_for_student() parameters.
+                      A submission is flagged when it contains at least
+                      MIN_MATCHED_PARAMS of another student's values that
+                      are not its own.
+
+Usage:
+    python scripts/similarity.py submissions/ --output similarity.json
+    python scripts/similarity.py submissions/ --threshold 0.7 --starter path/to/src
+    python scripts/similarity.py submissions/ --max-df 0.1
+"""
+
+import argparse
+import ast
+import builtins
+import hashlib
+import io
+import json
+import keyword
+import random
+import sys
+import tokenize
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import expected_answers  # noqa: E402
+import get_variant  # noqa: E402
+from grade_cohort import REPO_ROOT, find_submissions  # noqa: E402
+from variant_index import VariantIndex, value_key  # noqa: E402
+
+SHINGLE_SIZE = 5            # tokens per shingle
+NUM_PERM = 128              # MinHash signature length
+BANDS = 32                  # LSH bands (NUM_PERM // BANDS rows each)
+DEFAULT_THRESHOLD = 0.8     # Jaccard similarity reported as a match
+MIN_SHINGLES = 10           # fewer student-written shingles: nothing to compare
+MAX_SHINGLE_DF = 0.2        # shingles in a larger fraction of the cohort are common code
+MIN_MATCHED_PARAMS = 2      # another student's values needed to flag a submission
+
+# Values fixed by the lab instructions, used by every correct submission
+LAB_CONSTANTS = (expected_answers.DEPTH_START, expected_answers.CORE_RADIUS,
+                 expected_answers.ECONOMIC_THRESHOLD)
+
+_PRIME = (1 << 61) - 1
+_SKIPPED = {tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE, tokenize.INDENT,
+            tokenize.DEDENT, tokenize.ENDMARKER, tokenize.ENCODING}
+_BUILTINS = frozenset(dir(builtins))
+
+
+# ============================================================================
+# TOKENIZING
+# ============================================================================
+
+def _tokens(source: str) -> List[tokenize.TokenInfo]:
+    """Tokens of a source file; stops quietly at a syntax error."""
+    tokens = []
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(source).readline):
+            tokens.append(token)
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        pass
+    return tokens
+
+
+def normalized_tokens(source: str) -> List[str]:
+    """
+    Token stream with layout, comments and per-student details removed.
+
+    Variable names become ID and numbers NUM, so renaming variables or
+    substituting one's own values does not hide copied code. Keywords,
+    builtins, attribute names, operators and strings are kept.
+    """
+    normalized = []
+    previous = ''
+    for token in _tokens(source):
+        if token.type in _SKIPPED:
+            continue
+        if token.type == tokenize.NAME:
+            keep = (keyword.iskeyword(token.string) or token.string in _BUILTINS
+                    or previous == '.')
+            text = token.string if keep else 'ID'
+        elif token.type == tokenize.NUMBER:
+            text = 'NUM'
+        else:
+            text = token.string
+        normalized.append(text)
+        previous = token.string
+    return normalized
+
+
+def shingles(source: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """64-bit hashes of every run of `size` consecutive normalized tokens."""
+    tokens = normalized_tokens(source)
+    return {
+        int.from_bytes(hashlib.blake2b('\x1f'.join(tokens[i:i + size]).encode(),
+                                       digest_size=8).digest(), 'big')
+        for i in range(max(len(tokens) - size + 1, 0))
+    }
+
+
+def literals(source: str) -> Set[Tuple[str, Any]]:
+    """Value keys of every number and plain string literal in a source file."""
+    found = set()
+    for token in _tokens(source):
+        if token.type not in (tokenize.NUMBER, tokenize.STRING):
+            continue
+        try:
+            value = ast.literal_eval(token.string)
+        except (ValueError, SyntaxError):
+            continue  # f-strings and the like
+        key = value_key(value)
+        if key is not None:
+            found.add(key)
+    return found
+
+
+def submission_sources(src_dir: Path) -> Dict[str, str]:
+    """Source text of each lab1_*.py file in a src/ folder, by file name."""
+    sources = {}
+    for path in sorted(Path(src_dir).glob('lab1_*.py')):
+        try:
+            sources[path.name] = path.read_text(encoding='utf-8', errors='replace')
+        except OSError:
+            continue
+    return sources
+
+
+# ============================================================================
+# MINHASH / LSH
+# ============================================================================
+
+def _permutations(count: int = NUM_PERM, seed: int = 3061) -> List[Tuple[int, int]]:
+    """Fixed (a, b) pairs for the hash family h(x) = (a*x + b) mod p."""
+    rng = random.Random(seed)
+    return [(rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(count)]
+
+
+_PERMUTATIONS = _permutations()
+
+
+def minhash(shingle_set: Set[int]) -> Tuple[int, ...]:
+    """MinHash signature of a non-empty shingle set."""
+    return tuple(min((a * x + b) % _PRIME for x in shingle_set) for a, b in _PERMUTATIONS)
+
+
+def lsh_candidates(signatures: Dict[str, Tuple[int, ...]],
+                   bands: int = BANDS) -> Set[Tuple[str, str]]:
+    """Pairs of keys whose signatures agree on at least one whole band."""
+    rows = len(next(iter(signatures.values()), ())) // bands
+    candidates = set()
+    for band in range(bands):
+        buckets: Dict[Tuple[int, ...], List[str]] = {}
+        for key, signature in signatures.items():
+            buckets.setdefault(signature[band * rows:(band + 1) * rows], []).append(key)
+        for members in buckets.values():
+            for i, first in enumerate(members):
+                for second in members[i + 1:]:
+                    candidates.add((first, second) if first < second else (second, first))
+    return candidates
+
+
+def jaccard(first: Set[int], second: Set[int]) -> float:
+    """Exact Jaccard similarity of two sets."""
+    union = len(first | second)
+    return len(first & second) / union if union else 0.0
+
+
+# ============================================================================
+# COHORT CHECKS
+# ============================================================================
+
+def common_shingles(shingle_sets: Dict[str, Set[int]],
+                    max_df: float = MAX_SHINGLE_DF) -> Set[int]:
+    """
+    Shingles found in more than `max_df` of the submissions.
+
+    A shingle shared by only two submissions is never common, so a copied
+    pair is still reported in a small cohort.
+    """
+    counts = Counter(shingle for shingle_set in shingle_sets.values() for shingle in shingle_set)
+    limit = max(max_df * len(shingle_sets), 2)
+    return {shingle for shingle, count in counts.items() if count > limit}
+
+
+def similar_pairs(shingle_sets: Dict[str, Set[int]],
+                  threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Submissions whose student-written shingles overlap by at least `threshold`.
+
+    Submissions with fewer than MIN_SHINGLES shingles left after removing
+    the starter code and common shingles are skipped (nothing to compare).
+    """
+    signatures = {key: minhash(shingle_set) for key, shingle_set in shingle_sets.items()
+                  if len(shingle_set) >= MIN_SHINGLES}
+    pairs = []
+    for first, second in lsh_candidates(signatures):
+        similarity = jaccard(shingle_sets[first], shingle_sets[second])
+        if similarity >= threshold:
+            pairs.append({'repos': [first, second], 'similarity': round(similarity, 4)})
+    return sorted(pairs, key=lambda pair: pair['similarity'], reverse=True)
+
+
+def borrowed_values(submission_literals: Dict[str, Set[Tuple[str, Any]]],
+                    students: Dict[str, str], index: VariantIndex) -> List[Dict[str, Any]]:
+    """
+    Submissions containing another cohort member's parameter values.
+
+    Args:
+        submission_literals: repo -> literal value keys (starter values removed)
+        students: repo -> student ID
+        index: Reverse index over the cohort's variants
+
+    Returns:
+        One entry per flagged repo, listing whose parameters it contains
+    """
+    flagged = []
+    for repo, found in sorted(submission_literals.items()):
+        student_id = students[repo]
+        matched = index.owners_of_keys(found, exclude=student_id)
+        matches = [{'student_id': other, 'parameters': sorted(names)}
+                   for other, names in sorted(matched.items())
+                   if len(names) >= MIN_MATCHED_PARAMS]
+        if matches:
+            flagged.append({'repo': repo, 'student_id': student_id, 'matches': matches})
+    return flagged
+
+
+def check_cohort(submissions_dir: str, starter_dir: Optional[str] = None,
+                 threshold: float = DEFAULT_THRESHOLD,
+                 max_df: float = MAX_SHINGLE_DF) -> Dict[str, Any]:
+    """
+    Run both similarity checks over a directory of submissions.
+
+    Args:
+        submissions_dir: Directory containing one checkout per student
+        starter_dir: Starter src/ folder whose code and literals are ignored
+            (default: this repository's src/)
+        threshold: Minimum Jaccard similarity reported for code
+        max_df: Fraction of the cohort above which a shingle is common code
+            and ignored
+
+    Returns:
+        Report dict with 'similar_pairs' and 'borrowed_values'
+    """
+    starter = submission_sources(Path(starter_dir) if starter_dir else REPO_ROOT / 'src')
+    starter_shingles = {name: shingles(source) for name, source in starter.items()}
+    ignored_literals = {value_key(value) for value in LAB_CONSTANTS}
+    for source in starter.values():
+        ignored_literals |= literals(source)
+
+    shingle_sets: Dict[str, Set[int]] = {}
+    submission_literals: Dict[str, Set[Tuple[str, Any]]] = {}
+    students: Dict[str, str] = {}
+    for repo in find_submissions(Path(submissions_dir)):
+        combined: Set[int] = set()
+        found: Set[Tuple[str, Any]] = set()
+        for name, source in submission_sources(repo / 'src').items():
+            combined |= shingles(source) - starter_shingles.get(name, set())
+            found |= literals(source)
+        shingle_sets[repo.name] = combined
+        submission_literals[repo.name] = found - ignored_literals
+        students[repo.name] = get_variant.extract_username_from_repo(repo.name)
+
+    common = common_shingles(shingle_sets, max_df)
+    shingle_sets = {repo: shingle_set - common for repo, shingle_set in shingle_sets.items()}
+
+    index = VariantIndex.for_students(sorted(set(students.values())))
+    return {
+        'assignment_id': get_variant.ASSIGNMENT_ID,
+        'threshold': threshold,
+        'max_df': max_df,
+        'submissions': len(shingle_sets),
+        'similar_pairs': similar_pairs(shingle_sets, threshold),
+        'borrowed_values': borrowed_values(submission_literals, students, index),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Similarity checks for Lab 1 submissions.')
+    parser.add_argument('submissions', help='Directory with one checkout per student')
+    parser.add_argument('--starter', metavar='DIR',
+                        help="Starter src/ folder to ignore (default: this repo's src/)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Minimum Jaccard similarity (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--max-df', type=float, default=MAX_SHINGLE_DF,
+                        help='Ignore code shared by more than this fraction of the '
+                             f'cohort (default: {MAX_SHINGLE_DF})')
+    parser.add_argument('--output', metavar='FILE', default='-',
+                        help='JSON report path (default: stdout)')
+    args = parser.parse_args(argv)
+
+    report = check_cohort(args.submissions, args.starter, args.threshold, args.max_df)
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Reverse Index from Parameter Values to Students for GGY3061 Lab 1
+
+Answers "who was assigned these values?" without recomputing variants:
+
+    index.students_with(sample_mass=14.3, sample_volume=6.1, sample_depth=312)
+    index.owners(14.3)        # {student_id: ['sample_mass'], ...}
+
+The index is built in one pass over a roster. Every value, and every
+combination of a student's values, is a dictionary key, so each lookup
+is O(1). owners() ignores parameter names, for matching literals found
+in a submission where it is not known which parameter they stand for.
+
+Usage:
+    python scripts/variant_index.py build --roster roster.csv --output index.json
+    python scripts/variant_index.py query index.json sample_mass=14.3 sample_depth=312
+"""
+
+import argparse
+import ast
+import itertools
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import get_variant  # noqa: E402
+
+ValueKey = Tuple[str, Any]
+
+
+def value_key(value: Any) -> Optional[ValueKey]:
+    """
+    Comparable key for a parameter or literal value (None if not comparable).
+
+    Numbers keep their type, so the literal 3 never matches a volume of 3.0;
+    strings compare stripped and case-folded.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return (type(value).__name__, value)
+    if isinstance(value, str) and value.strip():
+        return ('str', value.strip().casefold())
+    return None
+
+
+def _combination_key(params: Dict[str, Any]) -> tuple:
+    """Order-independent key for a set of (parameter name, value) pairs."""
+    return tuple(sorted((name, value_key(value)) for name, value in params.items()))
+
+
+class VariantIndex:
+    """
+    Inverted index over a cohort's assigned parameters.
+
+    Attributes:
+        parameters: student ID -> that student's parameters
+    """
+
+    def __init__(self):
+        self.parameters: Dict[str, Dict[str, Any]] = {}
+        self._combinations: Dict[tuple, List[str]] = {}
+        self._owners: Dict[ValueKey, Dict[str, List[str]]] = {}
+
+    def add_variant(self, variant: Dict[str, Any]) -> None:
+        """Index one student's variant under every value and value combination."""
+        student_id = variant['student_id']
+        params = {name: value for name, value in variant['parameters'].items()
+                  if value_key(value) is not None}
+        self.parameters[student_id] = params
+        names = sorted(params)
+        for size in range(1, len(names) + 1):
+            for subset in itertools.combinations(names, size):
+                key = _combination_key({name: params[name] for name in subset})
+                self._combinations.setdefault(key, []).append(student_id)
+        for name, value in params.items():
+            self._owners.setdefault(value_key(value), {}).setdefault(student_id, []).append(name)
+
+    @classmethod
+    def from_variants(cls, variants: Iterable[Dict[str, Any]]) -> 'VariantIndex':
+        """Build the index from already computed variants."""
+        index = cls()
+        for variant in variants:
+            index.add_variant(variant)
+        return index
+
+    @classmethod
+    def for_students(cls, student_ids: Iterable[str]) -> 'VariantIndex':
+        """Build the index for a roster in one pass."""
+        return cls.from_variants(get_variant.get_variants_for_students(student_ids))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def students_with(self, **params: Any) -> List[str]:
+        """Students assigned every one of the given parameter values."""
+        return list(self._combinations.get(_combination_key(params), ()))
+
+    def owners(self, value: Any) -> Dict[str, List[str]]:
+        """Students assigned this value, with the parameter(s) it was assigned for."""
+        return self._owners.get(value_key(value), {})
+
+    def owners_of_keys(self, keys: Iterable[ValueKey],
+                       exclude: Optional[str] = None) -> Dict[str, Set[str]]:
+        """
+        Bulk owners() over value keys, e.g. the literals of one submission.
+
+        Args:
+            keys: value_key() results
+            exclude: Student whose own values are skipped (the submission's author)
+
+        Returns:
+            student ID -> names of that student's parameters found among the keys
+        """
+        own = {value_key(value) for value in self.parameters.get(exclude, {}).values()}
+        matched: Dict[str, Set[str]] = {}
+        for key in keys:
+            if key in own:
+                continue
+            for student_id, names in self._owners.get(key, {}).items():
+                if student_id != exclude:
+                    matched.setdefault(student_id, set()).update(names)
+        return matched
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        """Write the indexed parameters as JSON (the maps are rebuilt on load)."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': get_variant.config_fingerprint(),
+                       'parameters': self.parameters}, f)
+
+    @classmethod
+    def load(cls, path: str) -> 'VariantIndex':
+        """Read an index written by save(); stale indexes load empty."""
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('fingerprint') != get_variant.config_fingerprint():
+            return cls()
+        return cls.from_variants({'student_id': student_id, 'parameters': params}
+                                 for student_id, params in data['parameters'].items())
+
+
+def parse_assignment(text: str) -> Tuple[str, Any]:
+    """Parse a `name=value` query term; values are Python literals or plain strings."""
+    name, sep, raw = text.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError(f'expected name=value, got {text!r}')
+    try:
+        value = ast.literal_eval(raw)
+    except (ValueError, SyntaxError):
+        value = raw
+    return name, value
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Reverse index of Lab 1 variant values.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help='Index every student on a roster')
+    build.add_argument('--roster', metavar='FILE', required=True,
+                       help='CSV or JSONL roster of student IDs')
+    build.add_argument('--output', metavar='FILE', required=True, help='Index JSON path')
+
+    query = commands.add_parser('query', help='Students assigned the given values')
+    query.add_argument('index', help='Index JSON written by build')
+    query.add_argument('values', nargs='+', type=parse_assignment, metavar='NAME=VALUE')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        index = VariantIndex.for_students(get_variant.read_roster(args.roster))
+        index.save(args.output)
+        print(f'{len(index.parameters)} students -> {args.output}')
+        return 0
+
+    index = VariantIndex.load(args.index)
+    for student_id in index.students_with(**dict(args.values)):
+        print(student_id)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
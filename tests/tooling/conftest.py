@@ -0,0 +1,86 @@
+"""
+Pytest configuration for the instructor tooling tests.
+Loads modules from scripts/ the same way the autograding workflow does.
+"""
+
+import importlib.util
+import sys
+import pytest
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent.parent.parent / "scripts"
+
+
+def load_script(name):
+    """Import scripts/<name>.py as a module."""
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def get_variant():
+    """The scripts/get_variant.py module."""
+    return load_script("get_variant")
+
+
+@pytest.fixture
+def grade_cohort(monkeypatch):
+    """The scripts/grade_cohort.py module, restoring the harness runner afterwards."""
+    module = load_script("grade_cohort")
+    module.load_test_module()
+    harness = sys.modules["harness"]
+    monkeypatch.setattr(harness, "_runner", harness.get_runner())
+    return module
+
+
+@pytest.fixture
+def harness(grade_cohort):
+    """The visible-test harness module (tests/visible/harness.py)."""
+    return sys.modules["harness"]
+
+
+@pytest.fixture
+def starter_submission(tmp_path):
+    """A submission directory holding one untouched copy of the starter code."""
+    import shutil
+    submissions = tmp_path / "submissions"
+    shutil.copytree(SCRIPTS_DIR.parent / "src", submissions / "ggy3061-lab01-ada" / "src")
+    return submissions
+
+
+@pytest.fixture(scope="session")
+def expected_answers():
+    """The scripts/expected_answers.py module."""
+    return load_script("expected_answers")
+
+
+@pytest.fixture(scope="session")
+def results_store():
+    """The scripts/results_store.py module."""
+    return load_script("results_store")
+
+
+@pytest.fixture(scope="session")
+def similarity():
+    """The scripts/similarity.py module."""
+    return load_script("similarity")
+
+
+@pytest.fixture(scope="session")
+def variant_index():
+    """The scripts/variant_index.py module."""
+    return load_script("variant_index")
+
+
+@pytest.fixture
+def checks(grade_cohort):
+    """The visible tests' declarative checks table (tests/visible/checks.py)."""
+    return importlib.import_module("checks")
+
+
+@pytest.fixture
+def grade_server(grade_cohort):
+    """The scripts/grade_server.py module (harness runner restored afterwards)."""
+    return load_script("grade_server")
@@ -0,0 +1,100 @@
+"""
+Tests for tests/visible/checks.py - the declarative variant checks table.
+"""
+
+import json
+
+pytest_plugins = ["pytester"]
+
+SOLUTION = {
+    "lab1_variables.py": """\
+depth = {sample_depth}
+grade = {grade_value}
+rock_type = '{rock_type}'
+is_processed = False
+print(f'Depth: {{depth}}, Type: {{type(depth)}}')
+print(f'Grade: {{grade}}, Type: {{type(grade)}}')
+print(f'Rock Type: {{rock_type}}, Type: {{type(rock_type)}}')
+print(f'Processed: {{is_processed}}, Type: {{type(is_processed)}}')
+""",
+    "lab1_calculations.py": """\
+import math
+mass, volume, depth_start, depth_end = {sample_mass}, {sample_volume}, 100, {sample_depth}
+print(f'Density: {{mass / volume:.2f}} kg/m3')
+interval = depth_end - depth_start
+print(f'Drilling interval: {{interval}} meters')
+print(f'Average depth: {{(depth_start + depth_end) / 2:.1f}} meters')
+print(f'Core volume: {{math.pi * 0.05**2 * interval:.4f}} cubic meters')
+""",
+    "lab1_input.py": """\
+sample_id = input('Sample ID: ')
+rock = input('Rock type: ')
+grade = float(input('Grade (%): '))
+depth = int(input('Depth (m): '))
+print('--- Sample Summary ---')
+print(f'Rock Type: {{rock}}')
+print(f'Depth: {{depth}} meters')
+print('Classification: ' + ('Economic' if grade >= 2.0 else 'Sub-economic'))
+""",
+}
+
+
+class TestChecksTable:
+    """Tests for resolving and evaluating the checks table"""
+
+    def test_cases_pass_for_a_correct_submission(self, checks, get_variant, tmp_path):
+        """A submission using its own values satisfies every case"""
+        for student_id in ("ada", "bob", "cyd"):
+            params = get_variant.get_variant_for_student(student_id)["parameters"]
+            src = tmp_path / student_id
+            src.mkdir()
+            for name, template in SOLUTION.items():
+                (src / name).write_text(template.format(**params))
+            for case in checks.cases(params):
+                case.verify(src)
+
+    def test_cases_fail_for_the_starter_code(self, checks, get_variant, starter_submission):
+        """Starter defaults and missing lines are reported per case"""
+        params = get_variant.get_variant_for_student("ada")["parameters"]
+        src = starter_submission / "ggy3061-lab01-ada" / "src"
+        harness = checks.harness
+        failures = {case.id: case.failure(harness.script_output(src / case.script, case.stdin))
+                    for case in checks.cases(params)}
+        assert all(failures.values())
+        assert failures["lab1_calculations-density"] == \
+            "lab1_calculations.py should print 'Density: {:.2f}'".format(
+                params["sample_mass"] / params["sample_volume"])
+
+    def test_cases_share_one_run_per_stdin(self, checks, get_variant, tmp_path):
+        """Every case of a script reuses the same cached execution"""
+        params = get_variant.get_variant_for_student("ada")["parameters"]
+        src = tmp_path
+        for name, template in SOLUTION.items():
+            (src / name).write_text(template.format(**params))
+        harness = checks.harness
+        before = len(harness.TIMINGS)
+        for case in checks.cases(params):
+            case.verify(src)
+        runs = {(t["script"], t["stdin"]) for t in harness.TIMINGS[before:]}
+        assert len(harness.TIMINGS) - before == len(runs) == 3
+
+    def test_plugin_collects_one_test_per_row(self, checks, pytester):
+        """A suite loading the plugin gets one variant_case test per CHECKS row"""
+        pytester.makeconftest('pytest_plugins = ["checks"]\n')
+        pytester.makepyfile(test_x="def test_x(variant_case):\n    assert variant_case.script\n")
+        result = pytester.runpytest_inprocess("-q", "--collect-only")
+        collected = [line for line in result.outlines if "test_x[" in line]
+        assert collected == [f"test_x.py::test_x[{check.id}]" for check in checks.CHECKS]
+        pytester.runpytest_inprocess("-q").assert_outcomes(passed=len(checks.CHECKS))
+
+    def test_variant_config(self, checks, get_variant, tmp_path, monkeypatch):
+        """The config is read like any variants file, with defaults when it is missing"""
+        config = tmp_path / ".variant_config.json"
+        monkeypatch.setattr(checks, "VARIANT_CONFIG", config)
+        assert checks.load_variant_config() == {"parameters": checks.DEFAULT_PARAMETERS}
+        variant = get_variant.get_variant_for_student("ada")
+        with open(config, "w") as out:
+            get_variant.write_variants([variant], out)
+        assert checks.load_variant_config() == variant
+        config.write_text(json.dumps(variant, indent=2))
+        assert checks.load_variant_config() == variant
@@ -0,0 +1,70 @@
+"""
+Tests for scripts/expected_answers.py - expected output of a correct submission.
+"""
+
+import pytest
+
+
+class TestExpectedAnswers:
+    """Tests for the expected-answer computation and index"""
+
+    _PARAMS = {"sample_depth": 312, "sample_mass": 14.3, "sample_volume": 6.1,
+               "rock_type": "Basalt", "grade_value": 1.75}
+
+    def test_calculation_lines(self, expected_answers):
+        """Formatted lines follow the lab's required rounding"""
+        lines = expected_answers.expected_calculations(self._PARAMS)["lines"]
+        assert lines == {
+            "Density": "2.34 kg/m3",
+            "Drilling interval": "212 meters",
+            "Average depth": "206.0 meters",
+            "Core volume": "1.6650 cubic meters",
+        }
+
+    def test_input_summary(self, expected_answers):
+        """The summary block uses the student's own rock type and grade"""
+        summary = expected_answers.expected_answers(self._PARAMS)["input_summary"]
+        assert summary["stdin"] == "GEO-001\nBasalt\n1.75\n312\n"
+        assert summary["lines"][-1] == "Classification: Sub-economic"
+
+    def test_index_deduplicates_parameter_sets(self, expected_answers, monkeypatch):
+        """In group scope every student in a group shares one entry"""
+        get_variant = expected_answers.get_variant
+        monkeypatch.setattr(get_variant, "PARAMETER_SCOPE", "group")
+        index = expected_answers.AnswerIndex.for_students(f"s{i}" for i in range(200))
+        assert len(index.answers) == get_variant.NUM_GROUPS
+        assert index.for_student("s7") == expected_answers.AnswerIndex.for_groups().answers[
+            index.students["s7"]]
+
+
+class TestBulkExpectedAnswers:
+    """Tests for the vectorized cohort engine"""
+
+    def test_bulk_matches_scalar(self, expected_answers):
+        """Bulk values and formatted strings equal the scalar computation"""
+        columns = expected_answers.parameter_columns(f"s{i}" for i in range(500))
+        bulk = expected_answers.expected_calculations_bulk(
+            columns["sample_mass"], columns["sample_volume"], columns["sample_depth"],
+            use_numpy=False)
+        for i, student_id in enumerate(columns["student_id"]):
+            params = expected_answers.get_variant.get_variant_for_student(student_id)["parameters"]
+            scalar = expected_answers.expected_calculations(params)
+            assert bulk["core_volume"][i] == scalar["core_volume"]
+            assert {label: bulk[label][i] for label in scalar["lines"]} == scalar["lines"]
+
+    def test_numpy_matches_array_fallback(self, expected_answers):
+        """The NumPy path gives exactly the same results as the fallback"""
+        pytest.importorskip("numpy")
+        columns = expected_answers.parameter_columns(f"s{i}" for i in range(500))
+        args = (columns["sample_mass"], columns["sample_volume"], columns["sample_depth"])
+        fast = expected_answers.expected_calculations_bulk(*args, use_numpy=True)
+        slow = expected_answers.expected_calculations_bulk(*args, use_numpy=False)
+        assert {k: list(v) for k, v in fast.items()} == {k: list(v) for k, v in slow.items()}
+
+    def test_numpy_requested_without_numpy(self, expected_answers, monkeypatch):
+        """Asking for NumPy when it is missing is a clear ImportError"""
+        monkeypatch.setattr(expected_answers, "numpy", None)
+        with pytest.raises(ImportError, match="requires NumPy"):
+            expected_answers.expected_calculations_bulk([14.3], [6.1], [312], use_numpy=True)
+        assert expected_answers.expected_calculations_bulk([14.3], [6.1], [312])["density"][0] \
+            == 14.3 / 6.1
@@ -0,0 +1,230 @@
+"""
+Tests for scripts/get_variant.py - variant generation must stay stable.
+"""
+
+import io
+import json
+import random
+import sys
+
+import pytest
+
+
+def _reference_variant(module, student_id):
+    """The original single-student computation, for comparison."""
+    seed = module.compute_seed(student_id)
+    group_id = module.compute_group(seed)
+    return {
+        "student_id": student_id,
+        "variant_seed": seed,
+        "group_id": group_id,
+        "parameters": module.generate_parameters(random.Random(seed), group_id),
+    }
+
+
+class TestBatchVariants:
+    """Tests for the roster / batch API"""
+
+    def test_batch_matches_single(self, get_variant):
+        """Batch generation should match the single-student path"""
+        ids = [f"student{i}" for i in range(300)]
+        batch = list(get_variant.get_variants_for_students(ids, chunksize=7))
+        assert batch == [_reference_variant(get_variant, i) for i in ids]
+
+    def test_batch_with_workers_matches_single(self, get_variant):
+        """Process-pool fan-out should preserve values and order"""
+        ids = [f"student{i}" for i in range(300)]
+        batch = list(get_variant.get_variants_for_students(ids, workers=2, chunksize=50))
+        assert batch == [get_variant.get_variant_for_student(i) for i in ids]
+
+    def test_workers_do_not_reload_the_module(self, get_variant, monkeypatch):
+        """Fan-out from an unregistered module registers it without executing a copy"""
+        monkeypatch.setitem(sys.modules, "get_variant", None)  # restored afterwards
+        del sys.modules["get_variant"]
+        batch = list(get_variant.get_variants_for_students(["ada", "alan"], workers=2))
+        assert [v["student_id"] for v in batch] == ["ada", "alan"]
+        assert sys.modules["get_variant"]._variants_for_chunk is get_variant._variants_for_chunk
+
+    def test_read_roster_csv_header(self, get_variant, tmp_path):
+        """CSV rosters should use the username column when present"""
+        roster = tmp_path / "roster.csv"
+        roster.write_text("name,username\nAda,ada\nAlan,alan\n")
+        assert list(get_variant.read_roster(str(roster))) == ["ada", "alan"]
+
+    def test_read_roster_jsonl(self, get_variant, tmp_path):
+        """JSONL rosters accept strings and objects"""
+        roster = tmp_path / "roster.jsonl"
+        roster.write_text('"ada"\n{"student_id": "alan"}\n')
+        assert list(get_variant.read_roster(str(roster))) == ["ada", "alan"]
+
+    def test_read_roster_rejects_unknown_fields(self, get_variant, tmp_path):
+        """Records and headers without an ID field are errors, not student IDs"""
+        roster = tmp_path / "roster.jsonl"
+        roster.write_text('{"student_id": "ada"}\n{"name": "Alan"}\n')
+        with pytest.raises(ValueError, match=r"roster.jsonl:2: .*no student ID field"):
+            list(get_variant.read_roster(str(roster)))
+        roster = tmp_path / "roster.csv"
+        roster.write_text("name,email\nAda,ada@example.com\n")
+        with pytest.raises(ValueError, match="no student ID column"):
+            list(get_variant.read_roster(str(roster)))
+        roster.write_text("ada\nalan\n")
+        assert list(get_variant.read_roster(str(roster))) == ["ada", "alan"]
+
+    def test_read_roster_header_names(self, get_variant, tmp_path):
+        """Header cells match ID fields regardless of case, spaces and hyphens"""
+        roster = tmp_path / "roster.csv"
+        roster.write_text("Name,GitHub Username\nAda,ada\n")
+        assert list(get_variant.read_roster(str(roster))) == ["ada"]
+        for header in ("Student ID", "student-id", "ID", "Login"):
+            roster.write_text(f"{header}\nada\nalan\n")
+            assert list(get_variant.read_roster(str(roster))) == ["ada", "alan"], header
+        roster.write_text("Class list\nada\n")
+        assert list(get_variant.read_roster(str(roster))) == ["ada"]
+
+    def test_read_roster_explicit_header(self, get_variant, tmp_path):
+        """header=True/False overrides detection of the first CSV row"""
+        roster = tmp_path / "roster.csv"
+        roster.write_text("students\nada\n")
+        assert list(get_variant.read_roster(str(roster))) == ["students", "ada"]
+        assert list(get_variant.read_roster(str(roster), header=True)) == ["ada"]
+        roster.write_text("username\nada\n")
+        assert list(get_variant.read_roster(str(roster), header=False)) == ["username", "ada"]
+
+    def test_read_roster_stdin(self, get_variant, monkeypatch):
+        """Rosters on stdin are read as JSONL or CSV according to their first line"""
+        monkeypatch.setattr(sys, "stdin", io.StringIO('\n"ada"\n{"Student ID": "alan"}\n'))
+        assert list(get_variant.read_roster("-")) == ["ada", "alan"]
+        monkeypatch.setattr(sys, "stdin", io.StringIO("name,username\nAda,ada\n"))
+        assert list(get_variant.read_roster("-")) == ["ada"]
+        monkeypatch.setattr(sys, "stdin", io.StringIO('"ada"\n'))
+        assert list(get_variant.read_roster("-", fmt="csv")) == ["ada"]
+        monkeypatch.setattr(sys, "stdin", io.StringIO(""))
+        assert list(get_variant.read_roster("-")) == []
+
+    def test_write_variants_csv(self, get_variant):
+        """CSV output should flatten the parameters into columns"""
+        out = io.StringIO()
+        count = get_variant.write_variants(
+            get_variant.get_variants_for_students(["ada"]), out, "csv")
+        header, row = out.getvalue().splitlines()
+        assert count == 1
+        assert header.startswith("student_id,variant_seed,group_id,sample_depth")
+        assert row.startswith("ada,")
+
+    def test_write_variants_jsonl(self, get_variant):
+        """JSONL output should have one variant per line"""
+        out = io.StringIO()
+        get_variant.write_variants(
+            get_variant.get_variants_for_students(["ada", "alan"]), out)
+        lines = out.getvalue().splitlines()
+        assert [json.loads(line)["student_id"] for line in lines] == ["ada", "alan"]
+
+    def test_read_variants_streams_jsonl_and_indented_json(self, get_variant, tmp_path):
+        """Compact JSONL is read line by line; pretty-printed JSON still loads"""
+        variants = [get_variant.get_variant_for_student(i) for i in ("ada", "alan")]
+        jsonl = tmp_path / "variants.jsonl"
+        with open(jsonl, "w") as out:
+            get_variant.write_variants(variants, out)
+        pretty = tmp_path / "variant.json"
+        pretty.write_text(json.dumps(variants[0], indent=2))
+        assert list(get_variant.read_variants(jsonl)) == variants
+        assert list(get_variant.read_variants(pretty)) == variants[:1]
+
+
+class TestVariantCache:
+    """Tests for the memoized and persistent variant caches"""
+
+    def test_memoized_result_is_a_copy(self, get_variant):
+        """Mutating a returned variant must not corrupt the memo"""
+        first = get_variant.get_variant_for_student("ada")
+        first["parameters"]["sample_depth"] = -1
+        assert get_variant.get_variant_for_student("ada") == _reference_variant(get_variant, "ada")
+
+    def test_persistent_cache_round_trip(self, get_variant, tmp_path):
+        """Variants written to the cache file are read back unchanged"""
+        path = tmp_path / "cache.json"
+        with get_variant.VariantCache(path) as cache:
+            expected = cache.get("ada")
+        reloaded = get_variant.VariantCache(path)
+        assert reloaded.variants == {"ada": expected}
+
+    def test_config_change_invalidates_cache(self, get_variant, tmp_path, monkeypatch):
+        """Changing SEED_SALT should discard stale cached variants"""
+        path = tmp_path / "cache.json"
+        with get_variant.VariantCache(path) as cache:
+            cache.get("ada")
+        monkeypatch.setattr(get_variant, "SEED_SALT", "OTHER_SALT")
+        reloaded = get_variant.VariantCache(path)
+        assert reloaded.variants == {}
+        assert reloaded.get("ada") == _reference_variant(get_variant, "ada")
+
+
+class TestRepoIdentification:
+    """Tests for reading the repository name without running git"""
+
+    def test_repo_name_keeps_trailing_git_letters(self, get_variant):
+        """Only a literal .git suffix is removed from the URL"""
+        url = "https://github.com/unza/ggy3061-lab01-tig.git"
+        assert get_variant.repo_name_from_url(url) == "ggy3061-lab01-tig"
+        assert get_variant.repo_name_from_url("git@github.com:unza/lab01-craig") == "lab01-craig"
+
+    def test_reads_origin_from_git_config(self, get_variant, tmp_path):
+        """The origin URL is read from .git/config"""
+        git_dir = tmp_path / "repo" / ".git"
+        git_dir.mkdir(parents=True)
+        (git_dir / "config").write_text(
+            '[core]\n\tbare = false\n'
+            '[remote "upstream"]\n\turl = https://github.com/unza/template.git\n'
+            '[remote "origin"]\n\turl = git@github.com:unza/ggy3061-lab01-ada.git\n'
+        )
+        found = get_variant.find_git_dir(tmp_path / "repo")
+        assert found == git_dir.resolve()
+        assert get_variant.read_remote_url(found) == "git@github.com:unza/ggy3061-lab01-ada.git"
+
+    def test_follows_worktree_gitdir_file(self, get_variant, tmp_path):
+        """Worktrees point at the main repository's config via gitdir/commondir"""
+        main_git = tmp_path / "main" / ".git"
+        worktree_git = main_git / "worktrees" / "wt"
+        worktree_git.mkdir(parents=True)
+        (main_git / "config").write_text(
+            '[remote "origin"]\n\turl = https://github.com/unza/ggy3061-lab01-alan\n')
+        (worktree_git / "commondir").write_text("../..\n")
+        checkout = tmp_path / "wt"
+        checkout.mkdir()
+        (checkout / ".git").write_text(f"gitdir: {worktree_git}\n")
+        assert get_variant.read_remote_url(get_variant.find_git_dir(checkout)) == \
+            "https://github.com/unza/ggy3061-lab01-alan"
+
+
+class TestCounterMode:
+    """Tests for RNG_MODE = 'counter' (per-parameter hashing)"""
+
+    def test_compat_mode_is_default(self, get_variant):
+        """lab01 keeps its Mersenne Twister values unless the flag is changed"""
+        assert get_variant.RNG_MODE == "compat"
+        assert get_variant.get_variant_for_student("ada") == _reference_variant(get_variant, "ada")
+
+    def test_counter_values_follow_the_spec(self, get_variant, monkeypatch):
+        """Counter-mode values are deterministic and within each parameter's range"""
+        monkeypatch.setattr(get_variant, "RNG_MODE", "counter")
+        variants = list(get_variant.get_variants_for_students(f"s{i}" for i in range(500)))
+        assert variants == [get_variant.get_variant_for_student(f"s{i}") for i in range(500)]
+        for variant in variants:
+            params = variant["parameters"]
+            assert 150 <= params["sample_depth"] <= 450
+            assert 10.0 <= params["sample_mass"] <= 25.0
+            assert round(params["grade_value"], 2) == params["grade_value"]
+            assert params["rock_type"] in get_variant.PARAMETER_SPEC["rock_type"][1]
+        assert len({v["parameters"]["sample_depth"] for v in variants}) > 200
+
+    def test_adding_a_parameter_keeps_the_others(self, get_variant, monkeypatch):
+        """A new PARAMETER_SPEC entry does not reshuffle existing values"""
+        monkeypatch.setattr(get_variant, "RNG_MODE", "counter")
+        before = get_variant.get_variant_for_student("ada")["parameters"]
+        fingerprint = get_variant.config_fingerprint()
+        spec = {"porosity": ("uniform", 0.05, 0.35, 2), **get_variant.PARAMETER_SPEC}
+        monkeypatch.setattr(get_variant, "PARAMETER_SPEC", spec)
+        after = get_variant.get_variant_for_student("ada")["parameters"]
+        assert {name: after[name] for name in before} == before
+        assert 0.05 <= after["porosity"] <= 0.35
+        assert get_variant.config_fingerprint() != fingerprint
@@ -0,0 +1,47 @@
+"""
+Cold-start regression test for scripts/get_variant.py, based on -X importtime.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent.parent.parent / "scripts"
+
+# Modules get_variant.py must only import on the code paths that need them
+DEFERRED_MODULES = {"argparse", "csv", "json", "subprocess", "pathlib", "typing",
+                    "inspect", "concurrent.futures"}
+
+# Budget for everything `import get_variant` pulls in, excluding compiling
+# the module itself. Measured at ~15 ms; the margin absorbs slow CI runners.
+IMPORT_BUDGET_US = 50_000
+
+
+def _importtime(code):
+    """Run code under -X importtime; return {module: (self_us, cumulative_us)}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=SCRIPTS_DIR, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+class TestColdStart:
+    """Tests for the import cost of get_variant.py"""
+
+    def test_heavy_modules_are_deferred(self):
+        """Importing the module must not load CLI/IO-only dependencies"""
+        baseline = _importtime("pass")
+        imported = set(_importtime("import get_variant")) - set(baseline)
+        assert not imported & DEFERRED_MODULES
+
+    def test_import_time_within_budget(self):
+        """Dependencies imported by get_variant stay under the budget"""
+        self_us, cumulative_us = _importtime("import get_variant")["get_variant"]
+        assert cumulative_us - self_us < IMPORT_BUDGET_US
@@ -0,0 +1,97 @@
+"""
+Tests for scripts/grade_cohort.py - cohort scores must match the workflow.
+"""
+
+import shutil
+import subprocess
+
+
+class TestGradeCohort:
+    """Tests for the parallel grading driver"""
+
+    def test_score_uses_workflow_formula(self, grade_cohort):
+        """Score should be passed / total * 40"""
+        assert grade_cohort.visible_score(18, 30) == 24.0
+        assert grade_cohort.visible_score(0, 0) == 0
+
+    def test_grades_starter_submission(self, grade_cohort, starter_submission):
+        """The untouched starter passes only the checks that need no student code"""
+        report = grade_cohort.grade_cohort(starter_submission, workers=1)
+        (entry,) = report["repos"]
+        assert entry["student_id"] == "ada"
+        assert entry["summary"] == {"passed": 18, "failed": 12, "total": 30}
+        assert entry["score"] == 24.0
+
+    def test_async_backend_matches_process_backend(self, grade_cohort, starter_submission):
+        """Both backends must produce the same per-test outcomes"""
+        process = grade_cohort.grade_cohort(starter_submission, workers=1)
+        grade_cohort.sys.modules["harness"]._RUN_CACHE.clear()
+        async_ = grade_cohort.grade_cohort(starter_submission, backend="async", concurrency=4)
+        outcomes = [[(t["nodeid"], t["outcome"]) for t in entry["tests"]]
+                    for report in (process, async_) for entry in report["repos"]]
+        assert outcomes[0] == outcomes[1]
+        assert {t["runner"] for t in async_["repos"][0]["scripts"]} == {"async"}
+
+    def test_async_backend_isolates_undecodable_output(self, grade_cohort, starter_submission):
+        """A script printing invalid UTF-8 fails its own tests, not the whole cohort"""
+        broken = starter_submission / "ggy3061-lab01-bob" / "src"
+        shutil.copytree(starter_submission / "ggy3061-lab01-ada" / "src", broken)
+        (broken / "lab1_strings.py").write_text("import sys\nsys.stdout.buffer.write(b'\\xff\\n')\n")
+        grade_cohort.sys.modules["harness"]._RUN_CACHE.clear()
+        report = grade_cohort.grade_cohort(starter_submission, backend="async", concurrency=4)
+        entries = {entry["student_id"]: entry for entry in report["repos"]}
+        assert entries["ada"]["summary"]["passed"] == 18
+        assert entries["bob"]["summary"]["total"] == 30
+        errors = [t for t in entries["bob"]["scripts"] if "error" in t]
+        assert errors and errors[0]["error"].startswith("UnicodeDecodeError")
+
+    def test_timings_and_summary(self, grade_cohort, harness, tmp_path):
+        """Each execution is recorded once, and the summary ranks the slowest runs"""
+        slow = tmp_path / "lab1_setup.py"
+        slow.write_text("import time\ntime.sleep(0.05)\nprint('ok')\n")
+        hang = tmp_path / "lab1_input.py"
+        hang.write_text("while True:\n    pass\n")
+        before = len(harness.TIMINGS)
+        harness.run_script(slow, runner=harness.RUNNER_SUBPROCESS)
+        harness.run_script(slow, runner=harness.RUNNER_SUBPROCESS)  # cached: not recorded
+        try:
+            harness.run_script(hang, "x\n", timeout=0.5, runner=harness.RUNNER_SUBPROCESS)
+        except subprocess.TimeoutExpired:
+            pass
+        finished, timed_out = harness.TIMINGS[before:]
+        assert finished["script"] == "lab1_setup.py" and finished["path"] == str(slow)
+        assert (finished["runner"], finished["stdin"], finished["returncode"],
+                finished["timed_out"]) == ("subprocess", None, 0, False)
+        assert finished["wall_time"] >= 0.05 and finished["cpu_time"] >= 0
+        assert finished["peak_rss_kb"] > 0
+        assert (timed_out["stdin"], timed_out["returncode"], timed_out["timed_out"]) == \
+            ("x\n", None, True)
+
+        entries = [{"repo": "fast", "duration": 0.5, "scripts": [finished]},
+                   {"repo": "slow", "duration": 2.0, "scripts": [timed_out]}]
+        summary = grade_cohort.timing_summary(entries, n=1)
+        assert (summary["script_runs"], summary["timeouts"]) == (2, 1)
+        assert summary["slowest_scripts"] == [{
+            "repo": "slow", "script": "lab1_input.py", "wall_time": timed_out["wall_time"],
+            "cpu_time": timed_out["cpu_time"], "peak_rss_kb": timed_out["peak_rss_kb"],
+            "timed_out": True,
+        }]
+        assert summary["slowest_repos"] == [{"repo": "slow", "duration": 2.0}]
+
+    def test_peak_rss_is_per_script(self, harness, tmp_path):
+        """A heavy script does not inflate the peak RSS recorded for the next one"""
+        heavy = tmp_path / "lab1_calculations.py"
+        heavy.write_text("block = bytearray(150 * 1024 * 1024)\n"
+                         "block[::4096] = b'x' * len(block[::4096])\n")
+        small = tmp_path / "lab1_strings.py"
+        small.write_text("print('small')\n")
+        for runner in (harness.RUNNER_SUBPROCESS, harness.RUNNER_POOL):
+            harness.run_script(heavy, runner=runner)
+            heavy_rss = harness.TIMINGS[-1]["peak_rss_kb"]
+            harness.run_script(small, runner=runner)
+            small_rss = harness.TIMINGS[-1]["peak_rss_kb"]
+            assert heavy_rss > 150 * 1024 > 2 * small_rss, runner
+            assert harness.TIMINGS[-1]["cpu_time"] is not None
+        harness.run_script(small, runner=harness.RUNNER_INPROCESS)
+        assert harness.TIMINGS[-1]["peak_rss_kb"] is None
+        assert harness.TIMINGS[-1]["cpu_time"] >= 0
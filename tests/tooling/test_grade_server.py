@@ -0,0 +1,74 @@
+"""
+Tests for scripts/grade_server.py - the local grading daemon.
+"""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+
+@pytest.fixture
+def server_url(grade_server):
+    """A daemon on a free loopback port, shut down after the test."""
+    server = grade_server.make_server(grade_server.GradingService(runner="inprocess"), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _request(url, body=None):
+    data = None if body is None else json.dumps(body).encode()
+    try:
+        with urllib.request.urlopen(url, data=data, timeout=30) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.load(exc)
+
+
+class TestGradeServer:
+    """Tests for the HTTP grading interface"""
+
+    def test_grade_matches_grade_cohort(self, server_url, grade_cohort, starter_submission):
+        """A graded checkout gets the same score JSON as grade_cohort"""
+        repo = starter_submission / "ggy3061-lab01-ada"
+        status, entry = _request(f"{server_url}/grade", {"repo": str(repo)})
+        expected = grade_cohort.grade_repository(repo)
+        assert status == 200
+        assert (entry["student_id"], entry["summary"], entry["score"]) == \
+            (expected["student_id"], expected["summary"], expected["score"])
+        assert [t["outcome"] for t in entry["tests"]] == [t["outcome"] for t in expected["tests"]]
+
+        status, health = _request(f"{server_url}/health")
+        assert (status, health["graded"]) == (200, 1)
+
+    def test_bad_requests(self, server_url, tmp_path):
+        """Malformed jobs and missing checkouts are rejected without grading"""
+        assert _request(f"{server_url}/grade", {"path": "x"})[0] == 400
+        assert _request(f"{server_url}/grade", {"repo": str(tmp_path / "missing")})[0] == 404
+        assert _request(f"{server_url}/health")[1]["graded"] == 0
+
+    def test_grading_errors_are_reported(self, server_url, grade_server, starter_submission,
+                                         monkeypatch):
+        """An exception while grading is a 500 JSON reply, and the daemon keeps serving"""
+        def broken(repo_path, variant=None):
+            raise RuntimeError("pytest crashed")
+        monkeypatch.setattr(grade_server.grade_cohort, "grade_repository", broken)
+        repo = starter_submission / "ggy3061-lab01-ada"
+        status, body = _request(f"{server_url}/grade", {"repo": str(repo)})
+        assert status == 500 and "RuntimeError: pytest crashed" in body["error"]
+        assert _request(f"{server_url}/health")[0] == 200
+
+    def test_remote_hosts_need_an_explicit_flag(self, grade_server):
+        """Only loopback addresses are served unless remote access is allowed"""
+        assert grade_server.is_loopback("127.0.0.1") and grade_server.is_loopback("::1")
+        assert grade_server.is_loopback("localhost")
+        assert not grade_server.is_loopback("0.0.0.0")
+        with pytest.raises(ValueError, match="non-loopback"):
+            grade_server.make_server(None, "0.0.0.0", 0)
+        with pytest.raises(SystemExit):
+            grade_server.main(["--host", "0.0.0.0"])
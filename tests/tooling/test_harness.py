@@ -0,0 +1,417 @@
+"""
+Tests for tests/visible/harness.py - the script execution harness.
+"""
+
+import builtins
+import math
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
+pytest_plugins = ["pytester"]
+
+INPUT_SCRIPT = """\
+sample_id = input('Sample ID: ')
+rock = input('Rock type: ')
+grade = float(input('Grade (%): '))
+depth = int(input('Depth (m): '))
+print('--- Sample Summary ---')
+print(f'Grade: {grade:.2f}%')
+print('Classification: ' + ('Economic' if grade >= 2.0 else 'Sub-economic'))
+"""
+
+
+@pytest.fixture
+def checkout(pytester):
+    """A copy of this repository's src/, scripts/ and visible tests."""
+    repo = Path(__file__).resolve().parent.parent.parent
+    for part in ("src", "scripts", "tests/visible"):
+        shutil.copytree(repo / part, pytester.path / part,
+                        ignore=shutil.ignore_patterns("__pycache__"))
+    return pytester.path
+
+
+class TestInProcessRunner:
+    """Tests for running scripts inside the test process"""
+
+    RETRY_LOOP = """\
+while True:
+    try:
+        depth = float(input('Depth (m): '))
+        break
+    except:
+        pass
+"""
+
+    def test_swallowed_timeout_still_stops_the_script(self, harness, tmp_path):
+        """A bare except around input() cannot outlast the timeout"""
+        script = tmp_path / "lab1_input.py"
+        script.write_text(self.RETRY_LOOP)
+        started = time.perf_counter()
+        with pytest.raises(subprocess.TimeoutExpired):
+            harness._run_inprocess(script, "", timeout=1)
+        assert time.perf_counter() - started < 2
+
+    def test_builtins_changes_are_undone(self, harness, tmp_path):
+        """A script patching builtins affects neither later scripts nor the tests"""
+        patch = tmp_path / "lab1_setup.py"
+        patch.write_text("import builtins\nbuiltins.print = lambda *a, **k: None\n"
+                         "builtins.extra = 1\ndel builtins.round\n")
+        check = tmp_path / "lab1_strings.py"
+        check.write_text("print(round(2.5), hasattr(__builtins__, 'extra'))\n")
+        assert harness._run_inprocess(patch, None, timeout=5).returncode == 0
+        assert harness._run_inprocess(check, None, timeout=5).stdout == "2 False\n"
+
+
+class TestScenarioRunner:
+    """Tests for replaying stdin scenarios in one interpreter"""
+
+    def test_scenarios_match_subprocess_runs(self, harness, tmp_path):
+        """Each replayed scenario gives the same output as a fresh interpreter"""
+        script = tmp_path / "lab1_input.py"
+        script.write_text(INPUT_SCRIPT)
+        scenarios = [harness.input_payload("GEO-001", rock, grade, depth)
+                     for rock, grade, depth in [("Granite", 2.0, 200), ("Basalt", 1.99, -5),
+                                                ("Schist", 4.5, 450)]]
+        replayed = harness.run_scenarios(script, scenarios)
+        for scenario, output in zip(scenarios, replayed):
+            fresh = subprocess.run([sys.executable, str(script)], input=scenario,
+                                   capture_output=True, text=True)
+            assert (output.returncode, output.stdout) == (fresh.returncode, fresh.stdout)
+        assert [o.field("classification") for o in replayed] == \
+            ["Economic", "Sub-economic", "Economic"]
+
+    def test_scenario_errors_are_reported_per_case(self, harness, tmp_path):
+        """A bad scenario fails on its own without affecting the others"""
+        script = tmp_path / "lab1_input.py"
+        script.write_text(INPUT_SCRIPT)
+        good, bad = harness.run_scenarios(script, [
+            harness.input_payload("GEO-001", "Granite", 2.5, 200),
+            harness.input_payload("GEO-001", "Granite", "not-a-number", 200),
+        ])
+        assert good.returncode == 0
+        assert bad.returncode == 1 and "ValueError" in bad.stderr
+
+    def test_scenarios_are_isolated(self, harness, tmp_path):
+        """A retry loop times out alone, and one scenario's patches do not leak"""
+        script = tmp_path / "lab1_input.py"
+        script.write_text(TestInProcessRunner.RETRY_LOOP + "import builtins\n"
+                          "print(getattr(builtins, 'seen', 'first'))\nbuiltins.seen = depth\n")
+        started = time.perf_counter()
+        hung, first, second = harness.run_scenarios(script, ["", "-5\n", "300\n"], timeout=1)
+        assert isinstance(hung, subprocess.TimeoutExpired)
+        assert time.perf_counter() - started < 4
+        assert first.stdout == second.stdout == "Depth (m): first\n"
+        assert not hasattr(builtins, "seen")
+
+    def test_scenarios_do_not_answer_for_other_runners(self, harness, tmp_path):
+        """The run cache is per runner, so a scenario never stands in for a real run"""
+        script = tmp_path / "lab1_input.py"
+        script.write_text(INPUT_SCRIPT)
+        payload = harness.input_payload("GEO-001", "Granite", 2.5, 200)
+        (replayed,) = harness.run_scenarios(script, [payload])
+        result = harness.run_script(script, payload, runner=harness.RUNNER_SUBPROCESS)
+        assert harness.TIMINGS[-1]["runner"] == harness.RUNNER_SUBPROCESS
+        assert result.stdout == replayed.stdout
+
+
+class TestWorkerPool:
+    """Tests for the sandboxed worker pool runner"""
+
+    def test_pool_matches_subprocess_runs(self, harness, tmp_path):
+        """A pooled run gives the same output as a fresh interpreter"""
+        script = tmp_path / "lab1_input.py"
+        script.write_text(INPUT_SCRIPT)
+        payload = harness.input_payload("GEO-001", "Granite", 2.5, 200)
+        with harness.WorkerPool(size=1) as pool:
+            pooled = pool.run(script, payload)
+        fresh = subprocess.run([sys.executable, str(script)], input=payload,
+                               capture_output=True, text=True)
+        assert (pooled.returncode, pooled.stdout) == (fresh.returncode, fresh.stdout)
+
+    def test_crashed_worker_is_replaced(self, harness, tmp_path):
+        """A script that kills its worker reports the exit status; the pool recovers"""
+        crash = tmp_path / "crash.py"
+        crash.write_text("import os\nos._exit(3)\n")
+        script = tmp_path / "lab1_input.py"
+        script.write_text(INPUT_SCRIPT)
+        with harness.WorkerPool(size=1) as pool:
+            assert pool.run(crash).returncode == 3
+            result = pool.run(script, harness.input_payload("GEO-001", "Granite", 1.5, 200))
+        assert "Sub-economic" in result.stdout
+
+    def test_workers_are_sandboxed(self, harness, tmp_path):
+        """Sockets fail and runaway CPU use is killed by RLIMIT_CPU"""
+        network = tmp_path / "network.py"
+        network.write_text("import socket\nsocket.create_connection(('127.0.0.1', 80))\n")
+        spin = tmp_path / "spin.py"
+        spin.write_text("while True:\n    pass\n")
+        with harness.WorkerPool(size=1, cpu_limit=1) as pool:
+            assert "PermissionError" in pool.run(network).stderr
+            assert pool.run(spin, timeout=5).returncode == -signal.SIGXCPU
+
+    def test_network_namespace_blocks_raw_sockets(self, harness, tmp_path):
+        """_socket bypasses the socket module, but not the empty network namespace"""
+        with socket.create_server(("127.0.0.1", 0)) as server:
+            port = server.getsockname()[1]
+            script = tmp_path / "raw_socket.py"
+            script.write_text(f"import _socket\ns = _socket.socket()\n"
+                              f"s.connect(('127.0.0.1', {port}))\nprint('connected')\n")
+            with harness.WorkerPool(size=1) as pool:
+                if not pool.network_isolated:
+                    pytest.skip("the kernel does not allow a network namespace here")
+                result = pool.run(script)
+        assert result.returncode == 1 and "connected" not in result.stdout
+
+    def test_jobs_do_not_leak_state(self, harness, tmp_path):
+        """What one student's script patches is gone before the next job runs"""
+        patch = tmp_path / "patch.py"
+        patch.write_text("import builtins, math\nmath.pi = 3.0\n"
+                         "builtins.round = lambda *a: 42\nbuiltins.print = None\n")
+        check = tmp_path / "check.py"
+        check.write_text("import math\nprint(math.pi, round(2.5))\n")
+        with harness.WorkerPool(size=1) as pool:
+            assert pool.run(patch).returncode == 0
+            assert pool.run(check).stdout == f"{math.pi} 2\n"
+
+
+class TestScriptOutput:
+    """Tests for parsing `Label: value` lines into fields"""
+
+    @staticmethod
+    def _output(harness, stdout):
+        return harness.ScriptOutput(subprocess.CompletedProcess([], 0, stdout, ""))
+
+    def test_fields_are_case_insensitive(self, harness):
+        """Labels are stripped and lower-cased; lines without a label are skipped"""
+        output = self._output(harness, "--- Summary ---\n  Rock Type :  Basalt \n: 3\nno colon\n")
+        assert output.fields == {"rock type": "Basalt"}
+        assert output.field("ROCK TYPE") == "Basalt"
+        assert output.field("density") is None
+        assert output.field("density", "") == ""
+
+    def test_last_occurrence_wins(self, harness):
+        """A prompt echoed before the summary line does not shadow it"""
+        output = self._output(harness, "Grade (%): Grade (%): 2.50\nGrade (%): 2.50%\n")
+        assert output.field("grade (%)") == "2.50%"
+
+    @pytest.mark.parametrize("value, number", [
+        ("1.49 kg/m3", 1.49),
+        ("-3 meters", -3.0),
+        (".5 m", 0.5),
+        ("5. m", 5.0),
+        ("1e-05 cubic meters", 1e-05),
+        ("2.5E+3", 2500.0),
+        ("about +7", 7.0),
+        ("none", None),
+    ])
+    def test_number(self, harness, value, number):
+        """The first number in the value, including bare fractions and exponents"""
+        assert self._output(harness, f"Value: {value}\n").number("value") == number
+
+    @pytest.mark.parametrize("value, integer", [
+        ("125 meters", 125),
+        ("125.0 meters", 125),
+        ("1e3", 1000),
+        ("162.5 meters", None),
+        ("n/a", None),
+    ])
+    def test_integer(self, harness, value, integer):
+        """Whole numbers only; fractional or missing values give None"""
+        result = self._output(harness, f"Value: {value}\n").integer("value")
+        assert result == integer and type(result) is type(integer)
+        assert self._output(harness, "").integer("value") is None
+
+    def test_session_fixtures(self, pytester, checkout):
+        """lab1_outputs and lab1_scenarios parse the checkout's scripts"""
+        (checkout / "src" / "lab1_calculations.py").write_text(
+            "print(f'Drilling interval: {300 - 100} meters')\n"
+            "print(f'Core volume: {3.14159 * 0.05 ** 2 * 200:.4f} cubic meters')\n"
+        )
+        (checkout / "src" / "lab1_input.py").write_text(INPUT_SCRIPT)
+        (checkout / "tests" / "visible" / "test_fixtures.py").write_text(
+            "def test_outputs(lab1_outputs):\n"
+            "    assert set(lab1_outputs) >= {'lab1_calculations.py', 'lab1_input.py'}\n"
+            "    calculations = lab1_outputs['lab1_calculations.py']\n"
+            "    assert calculations.integer('drilling interval') == 200\n"
+            "    assert calculations.number('core volume') == 1.5708\n"
+            "    assert lab1_outputs['lab1_input.py'].field('classification') == 'Economic'\n"
+            "\n"
+            "def test_scenarios(lab1_scenarios):\n"
+            "    cases = ['A\\nB\\n2.5\\n10\\n', 'A\\nB\\n1.5\\n10\\n', 'A\\nB\\nx\\n']\n"
+            "    economic, subeconomic, bad = lab1_scenarios('lab1_input.py', cases)\n"
+            "    assert economic.field('classification') == 'Economic'\n"
+            "    assert subeconomic.number('grade') == 1.5\n"
+            "    assert bad.returncode != 0 and 'ValueError' in bad.stderr\n"
+        )
+        result = pytester.runpytest_subprocess("tests/visible/test_fixtures.py")
+        result.assert_outcomes(passed=2)
+
+
+class TestStaticPrecheck:
+    """Tests for deriving script output from the AST without running it"""
+
+    STRAIGHT_LINE = """\
+import math
+sample_id = 'GEO-2024-001'
+depth = 312
+print(f'Lowercase: {sample_id.lower()}', f'Year from ID: {sample_id[4:8]}', sep=' | ')
+print(f'Depth: {depth}, Type: {type(depth)}')
+print(f'Core volume: {math.pi * 0.05**2 * (depth - 100):.4f} cubic meters')
+print('Economic' if 2.5 >= 2.0 else 'Sub-economic', end='!\\n')
+"""
+
+    def test_static_output_matches_interpreter(self, harness, tmp_path):
+        """A straight-line script's derived output is exactly what Python prints"""
+        script = tmp_path / "lab1_strings.py"
+        script.write_text(self.STRAIGHT_LINE)
+        static = harness.static_script(script)
+        fresh = subprocess.run([sys.executable, str(script)], capture_output=True, text=True)
+        assert static.stdout == fresh.stdout
+
+    def test_scripts_needing_a_real_run(self, harness, tmp_path):
+        """Input, unknown calls, control flow and runtime errors are not modelled"""
+        for source in ("name = input('Sample ID: ')\nprint(name)\n",
+                       "import os\nprint(os.getcwd())\n",
+                       "for i in range(3):\n    print(i)\n",
+                       "print(1 / 0)\n",
+                       "print('x', file=None)\n"):
+            script = tmp_path / "lab1_input.py"
+            script.write_text(source)
+            assert harness.static_script(script).stdout is None, source
+
+    def test_expensive_calls_are_not_evaluated(self, harness, tmp_path):
+        """Arguments are bounded before a call, so no script can stall the grader"""
+        for source in ("import math\nprint(math.factorial(2 * 10**6))\n",
+                       "from math import comb\nprint(comb(10**6, 5 * 10**5))\n",
+                       "print('x'.center(10**9))\n",
+                       "print('1'.zfill(10**8))\n",
+                       "print(f'{1:>1000000000}')\n",
+                       "print(f'{1.5:.100000000f}')\n",
+                       "print(('ab' * 50000).replace('a', 'x' * 1000))\n",
+                       "print(7 ** 60 ** 2)\n"):
+            script = tmp_path / "lab1_strings.py"
+            script.write_text(source)
+            started = time.perf_counter()
+            assert harness.static_script(script).stdout is None, source
+            assert time.perf_counter() - started < 1.0, source
+
+    def test_precheck_is_opt_in(self, harness, tmp_path):
+        """By default every script goes through the selected runner"""
+        script = tmp_path / "lab1_calculations.py"
+        script.write_text("mass = 11.6  # TODO\n")
+        result = harness.run_script(script)
+        assert result.returncode == 0
+        assert harness.TIMINGS[-1]["runner"] != harness.STATIC
+
+    def test_run_script_skips_the_runner(self, harness, tmp_path, monkeypatch):
+        """Statically known scripts are answered without spawning a process"""
+        script = tmp_path / "lab1_calculations.py"
+        script.write_text("mass = 11.6  # TODO\n")
+        monkeypatch.setattr(harness, "_static_precheck", True)
+        monkeypatch.setattr(harness, "_EXECUTORS", {})
+        monkeypatch.setattr(harness, "_run_subprocess", None)
+        result = harness.run_script(script)
+        assert (result.returncode, result.stdout) == (0, "")
+        assert harness.TIMINGS[-1]["runner"] == harness.STATIC
+
+
+class TestProfiling:
+    """Tests for the opt-in cProfile runner"""
+
+    SLOW = """\
+def helper(n):
+    return sum(i * i for i in range(n))
+
+print('Density: 1.00 kg/m3')
+total = helper(200000)
+while True:
+    total += 1
+"""
+
+    def test_timeout_reports_hot_functions_and_location(self, harness, tmp_path, monkeypatch):
+        """A timed-out script still yields its profile and the line it was stuck on"""
+        script = tmp_path / "lab1_calculations.py"
+        script.write_text(self.SLOW)
+        monkeypatch.setattr(harness, "_profile_top", 5)
+        try:
+            harness.run_script(script, timeout=1)
+        except subprocess.TimeoutExpired as exc:
+            profile = exc.profile
+            assert exc.output == "Density: 1.00 kg/m3\n"
+        else:
+            raise AssertionError("expected a timeout")
+        assert profile["interrupted_at"][-1]["line"] in (6, 7)  # the while loop
+        assert "<genexpr>" in {entry["function"] for entry in profile["hot"]}
+        assert harness.TIMINGS[-1]["runner"] == harness.PROFILE
+        assert "Stopped at timeout in <module>" in harness.format_profile(profile)
+
+    def test_profiled_run_matches_plain_run(self, harness, tmp_path, monkeypatch):
+        """Output, exit status and tracebacks are unchanged under the profiler"""
+        script = tmp_path / "lab1_input.py"
+        script.write_text(INPUT_SCRIPT + "raise SystemExit(3)\n")
+        payload = harness.input_payload("GEO-001", "Granite", 2.5, 200)
+        monkeypatch.setattr(harness, "_profile_top", 3)
+        profiled = harness.run_script(script, payload)
+        fresh = subprocess.run([sys.executable, str(script)], input=payload,
+                               capture_output=True, text=True)
+        assert (profiled.returncode, profiled.stdout) == (fresh.returncode, fresh.stdout) == \
+            (3, fresh.stdout)
+        assert len(profiled.profile["hot"]) == 3
+
+
+class TestIncrementalMode:
+    """Tests for --lab1-incremental re-grading of a checkout"""
+
+    @staticmethod
+    def _run(pytester, *args):
+        """Outcome counts and replayed test names of one visible-suite run."""
+        report = pytester.path / "report.xml"
+        result = pytester.runpytest_subprocess("tests/visible", f"--junitxml={report}", *args)
+        replayed = {
+            case.get("name") for case in ElementTree.parse(report).iter("testcase")
+            if case.find("properties/property[@name='lab1_replayed']") is not None
+        }
+        outcomes = result.parseoutcomes()
+        return {key: outcomes.get(key, 0) for key in ("passed", "failed")}, replayed
+
+    def test_only_the_changed_script_is_rerun(self, pytester, checkout):
+        """After editing one script, only its class runs and the totals match a full run"""
+        full, replayed = self._run(pytester, "--lab1-incremental=state.json")
+        assert not replayed
+        with open(checkout / "src" / "lab1_strings.py", "a") as f:
+            f.write("print('Upper: GEO-2024-001')\n")
+        incremental, replayed = self._run(pytester, "--lab1-incremental=state.json")
+        rerun = {"test_strings_file_exists", "test_strings_runs_without_error",
+                 "test_prints_original_id", "test_prints_lowercase", "test_prints_replace",
+                 "test_prints_strip", "test_prints_slicing"}
+        assert replayed and not replayed & rerun
+        assert incremental == self._run(pytester)[0] == full
+
+    def test_suite_changes_invalidate_the_state(self, pytester, checkout):
+        """Editing the harness or the tests re-runs everything"""
+        self._run(pytester, "--lab1-incremental=state.json")
+        for suite_file in ("harness.py", "test_lab1.py"):
+            with open(checkout / "tests" / "visible" / suite_file, "a") as f:
+                f.write("\n# changed\n")
+            assert not self._run(pytester, "--lab1-incremental=state.json")[1], suite_file
+
+    def test_missing_script_is_replayed(self, pytester, checkout):
+        """A script that is still missing replays its failures; restoring it re-runs them"""
+        script = checkout / "src" / "lab1_input.py"
+        source = script.read_text()
+        script.unlink()
+        full, _ = self._run(pytester, "--lab1-incremental=state.json")
+        incremental, replayed = self._run(pytester, "--lab1-incremental=state.json")
+        assert "test_input_file_exists" in replayed and incremental == full
+        script.write_text(source)
+        restored, replayed = self._run(pytester, "--lab1-incremental=state.json")
+        assert "test_input_file_exists" not in replayed
+        assert restored == self._run(pytester)[0]
@@ -0,0 +1,75 @@
+"""
+Tests for scripts/results_store.py - columnar grading history.
+"""
+
+
+def _report(outcomes):
+    """A minimal pytest-json-report document."""
+    tests = [
+        {"nodeid": f"tests/visible/test_lab1.py::TestTask{task}X::test_{name}", "outcome": outcome}
+        for (task, name), outcome in outcomes.items()
+    ]
+    passed = sum(1 for t in tests if t["outcome"] == "passed")
+    return {"created": 0, "summary": {"passed": passed, "total": len(tests)}, "tests": tests}
+
+
+class TestResultsStore:
+    """Tests for ingesting reports and querying pass rates"""
+
+    def test_ingest_interns_test_ids(self, results_store, tmp_path):
+        """Test IDs are stored once no matter how many runs use them"""
+        store = results_store.ResultsStore(tmp_path)
+        store.ingest(_report({(1, "a"): "passed", (3, "b"): "failed"}), group_id=0)
+        store.ingest(_report({(1, "a"): "failed", (3, "b"): "failed"}), group_id=1)
+        assert len(store.nodeids) == 2
+        with store.column("outcome.u8") as outcomes:
+            assert list(outcomes) == [0, 1, 1, 1]
+
+    def test_pass_rates_survive_reopen(self, results_store, tmp_path):
+        """Queries on a reopened store aggregate every appended run"""
+        store = results_store.ResultsStore(tmp_path)
+        store.ingest(_report({(1, "a"): "passed", (3, "b"): "passed"}), group_id=0)
+        store.ingest(_report({(1, "a"): "passed", (3, "b"): "failed"}), group_id=1)
+
+        reopened = results_store.ResultsStore(tmp_path)
+        assert reopened.num_runs == 2
+        assert reopened.pass_rate_by_task()["Task 3"]["pass_rate"] == 0.5
+        assert reopened.pass_rate_by_group()[1] == {"passed": 1, "total": 2, "pass_rate": 0.5}
+        by_test = reopened.pass_rate_by_test()
+        assert by_test["tests/visible/test_lab1.py::TestTask1X::test_a"]["pass_rate"] == 1.0
+
+    def test_interrupted_ingest_is_rolled_back(self, results_store, tmp_path):
+        """Rows written without their runs.jsonl line are dropped on reopen"""
+        store = results_store.ResultsStore(tmp_path)
+        store.ingest(_report({(1, "a"): "passed", (3, "b"): "failed"}), group_id=0)
+        # A second ingest that died after the columns and half a runs.jsonl line
+        for name, values in (("run.u32", [1, 1]), ("test.u32", [0, 1]), ("outcome.u8", [0])):
+            with open(tmp_path / name, "ab") as f:
+                results_store.array(results_store.COLUMNS[name], values).tofile(f)
+        with open(tmp_path / "runs.jsonl", "a") as f:
+            f.write('{"created":0,')
+
+        reopened = results_store.ResultsStore(tmp_path)
+        assert reopened.num_runs == 1
+        for name in results_store.COLUMNS:
+            with reopened.column(name) as values:
+                assert len(values) == 2
+        reopened.ingest(_report({(1, "a"): "failed"}), group_id=1)
+        assert results_store.ResultsStore(tmp_path).pass_rate_by_group() == {
+            0: {"passed": 1, "total": 2, "pass_rate": 0.5},
+            1: {"passed": 0, "total": 1, "pass_rate": 0.0},
+        }
+
+    def test_partial_test_id_is_dropped(self, results_store, tmp_path):
+        """A half-written nodeids.txt line does not corrupt later test IDs"""
+        store = results_store.ResultsStore(tmp_path)
+        store.ingest(_report({(1, "a"): "passed"}), group_id=0)
+        with open(tmp_path / "nodeids.txt", "a") as f:
+            f.write("tests/visible/test_lab1.py::TestTask3X::test_b_part")
+
+        reopened = results_store.ResultsStore(tmp_path)
+        assert len(reopened.nodeids) == 1
+        reopened.ingest(_report({(1, "a"): "failed", (3, "b"): "passed"}), group_id=0)
+        by_test = results_store.ResultsStore(tmp_path).pass_rate_by_test()
+        assert by_test["tests/visible/test_lab1.py::TestTask3X::test_b"]["pass_rate"] == 1.0
+        assert by_test["tests/visible/test_lab1.py::TestTask1X::test_a"]["pass_rate"] == 0.5
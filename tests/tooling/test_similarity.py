@@ -0,0 +1,129 @@
+"""
+Tests for scripts/similarity.py - cohort code similarity and borrowed values.
+"""
+
+import shutil
+
+import pytest
+
+CALCULATIONS = """\
+import math
+
+mass = {mass}
+volume = {volume}
+depth_start = 100
+depth_end = {depth}
+
+density = mass / volume
+print(f'Density: {{density:.2f}} kg/m3')
+interval = depth_end - depth_start
+print(f'Drilling interval: {{interval}} meters')
+average = (depth_start + depth_end) / 2
+print(f'Average depth: {{average:.1f}} meters')
+radius = 0.05
+core_volume = math.pi * radius**2 * interval
+print(f'Core volume: {{core_volume:.4f}} cubic meters')
+"""
+
+REWRITTEN = """\
+from math import pi
+
+def report(label, value, unit):
+    print(label + ': ' + value + ' ' + unit)
+
+m, v, top, bottom = {mass}, {volume}, 100, {depth}
+report('Density', format(m / v, '.2f'), 'kg/m3')
+length = bottom - top
+report('Drilling interval', str(length), 'meters')
+report('Average depth', format((top + bottom) / 2, '.1f'), 'meters')
+report('Core volume', format(pi * 0.05 ** 2 * length, '.4f'), 'cubic meters')
+"""
+
+# Small edits students make to the canonical solution on their own
+CANONICAL_EDITS = [
+    ("", ""),
+    ("(depth_start + depth_end) / 2", "(depth_end + depth_start) / 2"),
+    ("radius**2", "radius * radius"),
+    ("math.pi * radius", "3.14159 * radius"),
+    ("{{density:.2f}}", "{{round(density, 2)}}"),
+    ("interval = depth_end - depth_start", "interval = abs(depth_end - depth_start)"),
+]
+
+COHORT = ["ada", "bob", "cyd", "dee", "eve", "fay", "gus", "hal"]
+
+
+@pytest.fixture
+def make_submission(starter_submission, similarity):
+    """Add a submission for a student, with lab1_calculations.py from a template."""
+    def _make(student_id, template, params=None):
+        src = starter_submission / f"ggy3061-lab01-{student_id}" / "src"
+        if not src.exists():
+            shutil.copytree(starter_submission / "ggy3061-lab01-ada" / "src", src)
+        params = params or similarity.get_variant.get_variant_for_student(student_id)["parameters"]
+        (src / "lab1_calculations.py").write_text(template.format(
+            mass=params["sample_mass"], volume=params["sample_volume"],
+            depth=params["sample_depth"]))
+        return params
+    return _make
+
+
+class TestCodeSimilarity:
+    """Tests for MinHash/LSH candidate pairs"""
+
+    def test_copied_code_with_own_values_is_paired(self, similarity, make_submission,
+                                                   starter_submission):
+        """Copies differing only in values match among canonical solutions"""
+        for student_id, (old, new) in zip(COHORT, CANONICAL_EDITS):
+            make_submission(student_id, CALCULATIONS.replace(old, new))
+        make_submission("gus", REWRITTEN)
+        make_submission("hal", REWRITTEN)
+        report = similarity.check_cohort(starter_submission)
+        assert [pair["repos"] for pair in report["similar_pairs"]] == \
+            [["ggy3061-lab01-gus", "ggy3061-lab01-hal"]]
+        assert report["similar_pairs"][0]["similarity"] == 1.0
+
+    def test_independent_canonical_solutions_are_not_paired(self, similarity, make_submission,
+                                                            starter_submission):
+        """Code most of the cohort writes is ignored, even when identical"""
+        for student_id, (old, new) in zip(COHORT, CANONICAL_EDITS * 2):
+            make_submission(student_id, CALCULATIONS.replace(old, new))
+        report = similarity.check_cohort(starter_submission)
+        assert report["similar_pairs"] == []
+        assert similarity.check_cohort(starter_submission, max_df=1.0)["similar_pairs"]
+
+    def test_common_shingles(self, similarity):
+        """Shingles above the cohort fraction are common; pairs never are"""
+        shingle_sets = {"a": {1, 2, 3}, "b": {1, 2}, "c": {1}, "d": {4}}
+        assert similarity.common_shingles(shingle_sets, max_df=0.5) == {1}
+        assert similarity.common_shingles({"a": {1}, "b": {1}}, max_df=0.1) == set()
+
+    def test_untouched_starter_code_is_not_compared(self, similarity, starter_submission):
+        """Starter shingles are removed, so unmodified submissions never match"""
+        shutil.copytree(starter_submission / "ggy3061-lab01-ada",
+                        starter_submission / "ggy3061-lab01-bob")
+        assert similarity.check_cohort(starter_submission)["similar_pairs"] == []
+
+    def test_lsh_finds_near_duplicates(self, similarity):
+        """Sets with high Jaccard similarity share an LSH band"""
+        first = set(range(1000))
+        second = set(range(50, 1050))
+        signatures = {"a": similarity.minhash(first), "b": similarity.minhash(second),
+                      "c": similarity.minhash(set(range(5000, 6000)))}
+        assert similarity.lsh_candidates(signatures) == {("a", "b")}
+
+
+class TestBorrowedValues:
+    """Tests for detecting another student's assigned values"""
+
+    def test_other_students_values_are_flagged(self, similarity, make_submission,
+                                               starter_submission):
+        """A submission using a classmate's values names that classmate"""
+        ada = make_submission("ada", CALCULATIONS)
+        make_submission("bob", REWRITTEN, params=ada)
+        report = similarity.check_cohort(starter_submission)
+        assert report["borrowed_values"] == [{
+            "repo": "ggy3061-lab01-bob",
+            "student_id": "bob",
+            "matches": [{"student_id": "ada",
+                         "parameters": ["sample_depth", "sample_mass", "sample_volume"]}],
+        }]
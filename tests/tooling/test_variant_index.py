@@ -0,0 +1,41 @@
+"""
+Tests for scripts/variant_index.py - reverse index from values to students.
+"""
+
+ROSTER = [f"s{i}" for i in range(300)]
+
+
+class TestVariantIndex:
+    """Tests for value and combination lookups"""
+
+    def test_combination_lookup_matches_brute_force(self, variant_index):
+        """students_with() agrees with recomputing every variant"""
+        get_variant = variant_index.get_variant
+        index = variant_index.VariantIndex.for_students(ROSTER)
+        params = get_variant.get_variant_for_student("s42")["parameters"]
+        query = {name: params[name] for name in ("sample_mass", "sample_volume", "sample_depth")}
+        expected = [s for s in ROSTER
+                    if all(get_variant.get_variant_for_student(s)["parameters"][name] == value
+                           for name, value in query.items())]
+        assert index.students_with(**query) == expected
+        assert "s42" in index.students_with(rock_type=params["rock_type"].upper())
+
+    def test_owners_of_literals(self, variant_index):
+        """Literals map to the students and parameters they were assigned for"""
+        index = variant_index.VariantIndex.from_variants([
+            {"student_id": "ada", "parameters": {"sample_mass": 14.3, "sample_depth": 312}},
+            {"student_id": "bob", "parameters": {"sample_mass": 20.1, "sample_depth": 312}},
+        ])
+        assert index.owners(312) == {"ada": ["sample_depth"], "bob": ["sample_depth"]}
+        assert index.owners(312.0) == {}
+        keys = [variant_index.value_key(v) for v in (14.3, 312)]
+        assert index.owners_of_keys(keys, exclude="bob") == {"ada": {"sample_mass"}}
+
+    def test_save_and_load(self, variant_index, tmp_path):
+        """A saved index answers the same queries after loading"""
+        index = variant_index.VariantIndex.for_students(ROSTER[:50])
+        path = tmp_path / "index.json"
+        index.save(path)
+        loaded = variant_index.VariantIndex.load(path)
+        params = index.parameters["s7"]
+        assert loaded.students_with(**params) == index.students_with(**params)
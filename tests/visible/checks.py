@@ -0,0 +1,164 @@
+"""
+Declarative Lab 1 output checks, resolved against a student's variant.
+
+Each row of CHECKS names a script, the stdin it is run with, an output
+label, the expected value as a function of the variant parameters, and a
+tolerance. Expected values and lab constants come from
+scripts/expected_answers.py, so the table and the answer key cannot drift
+apart. cases() turns the table into concrete VariantCase objects for one
+set of parameters; hidden-test generators call it (or dump the cases with
+as_dict()) for every student.
+
+This module is also a pytest plugin. A suite that loads it (in its
+top-level conftest.py: `pytest_plugins = ["checks"]`) gets every test
+taking a `variant_case` argument parametrized with one case per row,
+resolved for the student's variant. The visible suite does not load it,
+so its test count and score stay fixed.
+
+All cases for a script share one cached execution per stdin payload, so
+adding a row never adds a process.
+"""
+
+import math
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import harness
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / "scripts"))
+
+from expected_answers import (  # noqa: E402
+    SAMPLE_ID,
+    classify_grade,
+    expected_calculations,
+    input_scenario,
+)
+from get_variant import read_variants  # noqa: E402
+
+
+VARIANT_CONFIG = Path(__file__).resolve().parent.parent.parent / ".variant_config.json"
+
+# Parameters used when .variant_config.json has not been generated
+DEFAULT_PARAMETERS = {
+    "sample_depth": 250,
+    "sample_mass": 15.5,
+    "sample_volume": 5.2,
+    "rock_type": "Granite",
+    "grade_value": 2.45
+}
+
+
+def load_variant_config():
+    """Read .variant_config.json, or default values when it has not been generated."""
+    if VARIANT_CONFIG.exists():
+        # Only the first line is read; older pretty-printed configs still work
+        return next(read_variants(str(VARIANT_CONFIG)))
+    return {"parameters": dict(DEFAULT_PARAMETERS)}
+
+
+def _input_stdin(params):
+    return input_scenario(SAMPLE_ID, params["rock_type"], params["grade_value"],
+                          params["sample_depth"])["stdin"]
+
+
+def _calculation(name):
+    return lambda params: expected_calculations(params)[name]
+
+
+@dataclass(frozen=True)
+class Check:
+    """One row of the table: a labelled output line and how to compute its value."""
+
+    script: str
+    label: str
+    expected: Callable[[dict], Any]
+    tolerance: float = 0.0
+    stdin: Optional[Callable[[dict], str]] = None
+    name: str = ""
+
+    @property
+    def id(self):
+        return self.name or f"{Path(self.script).stem}-{self.label.lower().replace(' ', '_')}"
+
+
+CHECKS = (
+    # Task 2: the student's own values, printed with their types
+    Check("lab1_variables.py", "Depth", lambda p: p["sample_depth"]),
+    Check("lab1_variables.py", "Grade", lambda p: p["grade_value"], 0.005),
+    Check("lab1_variables.py", "Rock Type", lambda p: p["rock_type"]),
+    # Task 3: calculations, to the precision the lab asks for
+    Check("lab1_calculations.py", "Density", _calculation("density"), 0.005),
+    Check("lab1_calculations.py", "Drilling interval", _calculation("drilling_interval")),
+    Check("lab1_calculations.py", "Average depth", _calculation("average_depth"), 0.05),
+    Check("lab1_calculations.py", "Core volume", _calculation("core_volume"), 0.00005),
+    # Task 4: summary of the student's own sample, fed through stdin
+    Check("lab1_input.py", "Rock Type", lambda p: p["rock_type"], stdin=_input_stdin),
+    Check("lab1_input.py", "Depth", lambda p: p["sample_depth"], stdin=_input_stdin),
+    Check("lab1_input.py", "Classification", lambda p: classify_grade(p["grade_value"]),
+          stdin=_input_stdin),
+)
+
+
+@dataclass(frozen=True)
+class VariantCase:
+    """A Check resolved for one variant: concrete stdin and expected value."""
+
+    id: str
+    script: str
+    label: str
+    expected: Any
+    tolerance: float
+    stdin: Optional[str]
+
+    @property
+    def shown(self):
+        """The expected value as printed: rounded to the digits the tolerance allows."""
+        if not self.tolerance or isinstance(self.expected, str):
+            return str(self.expected)
+        digits = max(0, round(-math.log10(2 * self.tolerance)))
+        return f"{self.expected:.{digits}f}"
+
+    def failure(self, output):
+        """Why `output` (a harness.ScriptOutput) does not satisfy the case, or None."""
+        if output.returncode != 0:
+            return f"{self.script} failed: {output.stderr}"
+        shown = output.field(self.label)
+        if shown is None:
+            return f"{self.script} should print '{self.label}: {self.shown}'"
+        if isinstance(self.expected, str):
+            ok = shown.lower().startswith(self.expected.lower())
+        else:
+            value = output.number(self.label)
+            ok = value is not None and math.isclose(value, self.expected, rel_tol=0,
+                                                    abs_tol=self.tolerance + 1e-9)
+        if ok:
+            return None
+        return f"{self.label}: expected {self.shown}, got {shown!r}"
+
+    def verify(self, src_dir):
+        """Assert the case against the session-cached output of the script in src_dir."""
+        output = harness.script_output(Path(src_dir) / self.script, self.stdin)
+        message = self.failure(output)
+        assert message is None, message
+
+    def as_dict(self):
+        return {"id": self.id, "script": self.script, "label": self.label,
+                "expected": self.expected, "tolerance": self.tolerance, "stdin": self.stdin}
+
+
+def cases(params, checks=CHECKS):
+    """Resolve every check against one variant's parameters."""
+    return [
+        VariantCase(check.id, check.script, check.label, check.expected(params),
+                    check.tolerance, check.stdin(params) if check.stdin else None)
+        for check in checks
+    ]
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize tests taking `variant_case` with the checks table, resolved for this variant."""
+    if "variant_case" in metafunc.fixturenames:
+        variant_cases = cases(load_variant_config()["parameters"])
+        metafunc.parametrize("variant_case", variant_cases, ids=[case.id for case in variant_cases])
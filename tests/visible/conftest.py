@@ -3,28 +3,152 @@ Pytest configuration for Lab 1 visible tests.
 Loads variant configuration if available.
 """
 
-import json
+import functools
 import pytest
 from pathlib import Path
 
+import harness
+from checks import load_variant_config
+
+SRC_DIR = Path(__file__).parent.parent.parent / "src"
+
+_INCREMENTAL = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    """Register the Lab 1 harness options."""
+    parser.addoption(
+        "--lab1-runner",
+        choices=harness.RUNNERS,
+        default=None,
+        help="How to execute student scripts: 'subprocess' (isolated, default), "
+             "'inprocess' (fast) or 'pool' (sandboxed long-lived workers). "
+             "Also settable via LAB1_RUNNER."
+    )
+    parser.addoption(
+        "--lab1-precheck",
+        action="store_true",
+        default=False,
+        help="Derive the output of straight-line scripts from their AST instead of "
+             "running them (evaluated in the pytest process). Also settable via "
+             "LAB1_STATIC_PRECHECK=1."
+    )
+    parser.addoption(
+        "--lab1-profile",
+        nargs="?",
+        type=int,
+        const=10,
+        default=None,
+        metavar="N",
+        help="Run student scripts under cProfile and add the N hottest functions "
+             "(default 10) to failing tests' reports. Also settable via LAB1_PROFILE."
+    )
+    parser.addoption(
+        "--lab1-incremental",
+        nargs="?",
+        const=".lab1_incremental.json",
+        default=None,
+        metavar="STATE_FILE",
+        help="Only re-run test classes whose src/ script changed since the last "
+             "run; replay stored outcomes for the rest (default state file: "
+             ".lab1_incremental.json)."
+    )
+
+
+def pytest_configure(config):
+    """Apply the selected execution mode and incremental state to the harness."""
+    runner = config.getoption("--lab1-runner")
+    if runner:
+        harness.set_runner(runner)
+    if config.getoption("--lab1-precheck"):
+        harness.set_static_precheck(True)
+    if config.getoption("--lab1-profile") is not None:
+        harness.set_profile(config.getoption("--lab1-profile"))
+
+    state_file = config.getoption("--lab1-incremental")
+    if state_file:
+        here = Path(__file__).parent
+        suite_files = [here / "conftest.py", here / "test_lab1.py", here / "harness.py"]
+        config.stash[_INCREMENTAL] = harness.IncrementalState(state_file, suite_files)
+
+
+def _class_script(item):
+    """The src/ script a test class exercises (its SCRIPT attribute), if any."""
+    script = getattr(item.cls, "SCRIPT", None)
+    return SRC_DIR / script if script else None
+
+
+def _replay(stored):
+    """Stand-in for a test body that reproduces a stored outcome."""
+    if stored["outcome"] == "passed":
+        return
+    if stored["outcome"] == "skipped":
+        pytest.skip(stored["message"] or "skipped in a previous run")
+    pytest.fail(stored["message"] or "failed in a previous run", pytrace=False)
+
+
+def pytest_collection_modifyitems(config, items):
+    """In incremental mode, replay tests whose script is unchanged instead of running them."""
+    state = config.stash.get(_INCREMENTAL, None)
+    if state is None:
+        return
+    for item in items:
+        script = _class_script(item)
+        stored = state.stored_result(item.nodeid, script) if script else None
+        if stored is not None:
+            item.runtest = functools.partial(_replay, stored)
+            item.user_properties.append(("lab1_replayed", True))
+
+
+def _add_profiles(item, report, script):
+    """Attach the profiles of the failing test's script runs to its report."""
+    profiled = [t for t in harness.TIMINGS if t["path"] == str(script) and "profile" in t]
+    for timing in profiled:
+        stdin = "" if timing["stdin"] is None else f" (stdin {timing['stdin']!r})"
+        status = "timed out" if timing["timed_out"] else f"{timing['wall_time']:.3f}s"
+        report.sections.append((f"lab1 profile: {timing['script']}{stdin}, {status}",
+                                harness.format_profile(timing["profile"])))
+        item.user_properties.append(("lab1_profile", timing))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Store each test's outcome for the next incremental run; attach profiles to failures."""
+    outcome = yield
+    state = item.config.stash.get(_INCREMENTAL, None)
+    script = _class_script(item)
+    if script is None:
+        return
+    report = outcome.get_result()
+    if report.failed and harness.get_profile():
+        _add_profiles(item, report, script)
+    if state is None:
+        return
+    if report.when == "call" or (report.when == "setup" and not report.passed):
+        message = None if report.passed else report.longreprtext
+        state.record(item.nodeid, script, report.outcome, message)
+
+
+def pytest_sessionfinish(session):
+    """Write the incremental state file."""
+    state = session.config.stash.get(_INCREMENTAL, None)
+    if state is not None:
+        state.save()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_json_modifyreport(json_report):
+    """Add per-script timings to the pytest-json-report output."""
+    json_report["lab1_timings"] = {
+        "scripts": harness.TIMINGS,
+        "slowest": harness.slowest(harness.TIMINGS, 5),
+    }
+
 
 @pytest.fixture(scope="session")
 def variant_config():
     """Load student's variant configuration."""
-    config_path = Path(__file__).parent.parent.parent / ".variant_config.json"
-    if config_path.exists():
-        with open(config_path) as f:
-            return json.load(f)
-    # Default values for testing without variant config
-    return {
-        "parameters": {
-            "sample_depth": 250,
-            "sample_mass": 15.5,
-            "sample_volume": 5.2,
-            "rock_type": "Granite",
-            "grade_value": 2.45
-        }
-    }
+    return load_variant_config()
 
 
 @pytest.fixture
@@ -55,3 +179,28 @@ def expected_rock_type(variant_config):
 def expected_grade(variant_config):
     """Return expected grade value."""
     return variant_config["parameters"]["grade_value"]
+
+
+@pytest.fixture(scope="session")
+def lab1_output():
+    """Return a function giving the parsed, session-cached output of a script."""
+    def _output(script_name, input_data=None):
+        return harness.script_output(SRC_DIR / script_name, input_data)
+    return _output
+
+
+@pytest.fixture(scope="session")
+def lab1_scenarios():
+    """Return a function replaying many stdin scenarios against one script, one fork each."""
+    def _scenarios(script_name, scenarios):
+        return harness.run_scenarios(SRC_DIR / script_name, scenarios)
+    return _scenarios
+
+
+@pytest.fixture(scope="session")
+def lab1_outputs(lab1_output):
+    """Parsed output of every src/lab1_*.py, each executed once per session."""
+    return {
+        path.name: lab1_output(path.name, harness.DEFAULT_STDIN.get(path.name))
+        for path in sorted(SRC_DIR.glob("lab1_*.py"))
+    }
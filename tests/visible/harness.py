@@ -0,0 +1,1443 @@
+"""
+Execution harness for the Lab 1 visible tests.
+Runs student scripts in a fresh interpreter (default), in-process, or in a
+pool of sandboxed long-lived worker interpreters. With the opt-in static
+pre-check, scripts simple enough to evaluate from their AST (e.g. untouched
+starter TODOs) are not run at all.
+"""
+
+import ast
+import asyncio
+import atexit
+import builtins
+import functools
+import hashlib
+import io
+import json
+import locale
+import os
+import queue
+import re
+import select
+import signal
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_TIMEOUT = 10
+
+RUNNER_SUBPROCESS = "subprocess"
+RUNNER_INPROCESS = "inprocess"
+RUNNER_POOL = "pool"
+RUNNERS = (RUNNER_SUBPROCESS, RUNNER_INPROCESS, RUNNER_POOL)
+
+# Selected with `pytest --lab1-runner=...` or the LAB1_RUNNER env var.
+# The subprocess runner is the isolation fallback and stays the default.
+_runner = os.environ.get("LAB1_RUNNER", RUNNER_SUBPROCESS)
+
+# stdin used when a script that reads input() is run without a scenario
+DEFAULT_STDIN = {"lab1_input.py": "GEO-001\nGranite\n2.5\n200\n"}
+
+# Session-wide cache of script executions, keyed by
+# (script path, content hash, stdin payload, runner). Each unique run happens
+# once per runner, since runners differ in isolation and reported results.
+_RUN_CACHE = {}
+
+# Parsed ScriptOutput records, same keys as _RUN_CACHE
+_OUTPUT_CACHE = {}
+
+# One record per actual (uncached) execution: wall/CPU time and peak RSS
+TIMINGS = []
+
+# Compiled code objects for the in-process runner, keyed by (path, content hash)
+_CODE_CACHE = {}
+
+
+def set_runner(name):
+    """Select the execution mode used by run_script()."""
+    if name not in RUNNERS:
+        raise ValueError(f"Unknown runner {name!r}; expected one of {RUNNERS}")
+    global _runner
+    _runner = name
+
+
+def get_runner():
+    """Return the name of the active execution mode."""
+    return _runner
+
+
+def hash_file(path):
+    """Return the SHA-256 of a file's content, or None if it cannot be read."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _run_key(script_path, input_data, runner):
+    """Cache key for one execution: (script path, content hash, stdin payload, runner)."""
+    return (str(script_path), hash_file(script_path), input_data, runner)
+
+
+def run_script(script_path, input_data=None, timeout=DEFAULT_TIMEOUT, runner=None):
+    """Run a Python script and capture output (cached per session)."""
+    script_path = Path(script_path)
+    runner = runner or _runner
+    key = _run_key(script_path, input_data, runner)
+
+    if key not in _RUN_CACHE:
+        started = time.perf_counter()
+        result = _run_static(script_path, input_data)
+        if result is not None:
+            _RUN_CACHE[key] = result
+            _record_timing(script_path, input_data, result,
+                           time.perf_counter() - started, None, STATIC)
+    if key not in _RUN_CACHE:
+        execute = _EXECUTORS.get(runner, _run_subprocess)
+        if _profile_top:
+            # Profiled runs always get their own interpreter
+            runner, execute = PROFILE, _run_profiled
+        cpu_before = _cpu_clock(runner)
+        started = time.perf_counter()
+        try:
+            _RUN_CACHE[key] = execute(script_path, input_data, timeout)
+        except subprocess.TimeoutExpired as exc:
+            # Remember the timeout too, so a hanging script is only run once
+            _RUN_CACHE[key] = exc
+        _record_timing(script_path, input_data, _RUN_CACHE[key],
+                       time.perf_counter() - started, cpu_before, runner)
+
+    result = _RUN_CACHE[key]
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+def script_output(script_path, input_data=None, timeout=DEFAULT_TIMEOUT, runner=None):
+    """Run a script (cached) and return its parsed ScriptOutput record."""
+    key = _run_key(script_path, input_data, runner or _runner)
+    if key not in _OUTPUT_CACHE:
+        _OUTPUT_CACHE[key] = ScriptOutput(run_script(script_path, input_data, timeout, runner))
+    return _OUTPUT_CACHE[key]
+
+
+def input_payload(*answers):
+    """stdin text answering successive input() prompts, one value per line."""
+    return "".join(f"{answer}\n" for answer in answers)
+
+
+def run_scenarios(script_path, scenarios, timeout=DEFAULT_TIMEOUT):
+    """
+    Replay many stdin scenarios against one script.
+
+    The script is compiled once in this interpreter; each scenario forks a
+    child that execs the code object with its own stdin, so hundreds of
+    cases cost a fork each instead of an interpreter start-up. A scenario
+    that loops on bad input or patches globals only affects its own child.
+    Results are cached under the SCENARIO runner, so they never stand in
+    for (or reuse) runs made with the selected runner.
+
+    Returns:
+        One ScriptOutput per scenario, in order; a scenario that times out
+        yields its subprocess.TimeoutExpired instead
+    """
+    outputs = []
+    for input_data in scenarios:
+        try:
+            outputs.append(script_output(script_path, input_data, timeout, SCENARIO))
+        except subprocess.TimeoutExpired as exc:
+            outputs.append(exc)
+    return outputs
+
+
+def _cpu_clock(runner):
+    """CPU clock to diff around an in-process run; None for runners using a child."""
+    return time.process_time() if runner == RUNNER_INPROCESS else None
+
+
+def _child_usage(rusage):
+    """(CPU seconds, peak RSS in KiB) of one reaped child, from os.wait4()."""
+    # ru_maxrss is KiB on Linux but bytes on macOS
+    peak = rusage.ru_maxrss // 1024 if sys.platform == "darwin" else rusage.ru_maxrss
+    return round(rusage.ru_utime + rusage.ru_stime, 6), peak
+
+
+def _record_timing(script_path, input_data, result, wall_time, cpu_before, runner):
+    """
+    Append a TIMINGS record for one execution.
+
+    CPU time and peak RSS are those of the child that ran the script, as
+    reported by wait4() and attached to the result as `.usage` (subprocess,
+    pool and scenario runners). In-process runs share this interpreter's
+    memory, so they record CPU time only; async and profiled runs record
+    wall time only.
+    """
+    usage = getattr(result, "usage", None)
+    if usage is not None:
+        cpu_time, peak_rss = usage
+    else:
+        cpu_time = None if cpu_before is None else round(time.process_time() - cpu_before, 6)
+        peak_rss = None
+    timed_out = isinstance(result, subprocess.TimeoutExpired)
+    failed = isinstance(result, Exception) and not timed_out
+    TIMINGS.append({
+        "script": Path(script_path).name,
+        "path": str(script_path),
+        "stdin": input_data,
+        "runner": runner,
+        "wall_time": round(wall_time, 6),
+        "cpu_time": cpu_time,
+        "peak_rss_kb": peak_rss,
+        "returncode": None if timed_out or failed else result.returncode,
+        "timed_out": timed_out,
+    })
+    if failed:
+        TIMINGS[-1]["error"] = f"{type(result).__name__}: {result}"
+    profile = getattr(result, "profile", None)
+    if profile is not None:
+        TIMINGS[-1]["profile"] = profile
+
+
+def slowest(timings, n=10):
+    """Return the n slowest TIMINGS records, slowest first."""
+    return sorted(timings, key=lambda t: t["wall_time"], reverse=True)[:n]
+
+
+def _run_subprocess(script_path, input_data, timeout):
+    """
+    Run the script in a fresh interpreter.
+
+    Where the platform has pidfds (Linux), the child is reaped with wait4()
+    so the result carries its own CPU time and peak RSS as `.usage`; its
+    stdin and output go through temporary files, so nothing has to be
+    pumped through pipes while waiting.
+    """
+    if not hasattr(os, "pidfd_open"):
+        return subprocess.run(
+            [sys.executable, str(script_path)],
+            capture_output=True,
+            text=True,
+            input=input_data,
+            # Without a payload, input() sees EOF (as under pytest) instead of
+            # blocking on the grader's terminal
+            stdin=subprocess.DEVNULL if input_data is None else None,
+            timeout=timeout
+        )
+    import tempfile
+
+    args = [sys.executable, str(script_path)]
+    with tempfile.TemporaryFile() as stdin, tempfile.TemporaryFile() as stdout, \
+            tempfile.TemporaryFile() as stderr:
+        if input_data is not None:
+            stdin.write(input_data.encode(locale.getpreferredencoding(False)))
+            stdin.seek(0)
+        process = subprocess.Popen(args, stdout=stdout, stderr=stderr,
+                                   stdin=subprocess.DEVNULL if input_data is None else stdin)
+        pidfd = os.pidfd_open(process.pid)
+        try:
+            exited, _, _ = select.select([pidfd], [], [], timeout)
+        finally:
+            os.close(pidfd)
+        if not exited:
+            process.kill()
+        _, status, rusage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        output = []
+        for stream in (stdout, stderr):
+            stream.seek(0)
+            output.append(_decode(stream.read()))
+    if not exited:
+        result = subprocess.TimeoutExpired(args, timeout, output=output[0], stderr=output[1])
+        result.usage = _child_usage(rusage)
+        raise result
+    result = subprocess.CompletedProcess(args, process.returncode, *output)
+    result.usage = _child_usage(rusage)
+    return result
+
+
+# ============================================================================
+# ASYNC BULK RUNNER
+# ============================================================================
+
+def _decode(data):
+    """Decode child output the way subprocess.run(text=True) does."""
+    text = data.decode(locale.getpreferredencoding(False), errors="strict")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+async def run_script_async(script_path, input_data=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Run a script in a fresh interpreter without blocking the event loop.
+
+    Raises subprocess.TimeoutExpired after `timeout` seconds, like the
+    blocking runner. The child is killed on timeout or cancellation.
+    """
+    args = [sys.executable, str(script_path)]
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdin=asyncio.subprocess.DEVNULL if input_data is None else asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    payload = None if input_data is None else input_data.encode(locale.getpreferredencoding(False))
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(payload), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise subprocess.TimeoutExpired(args, timeout)
+    except asyncio.CancelledError:
+        process.kill()
+        await process.wait()
+        raise
+    return subprocess.CompletedProcess(args, process.returncode, _decode(stdout), _decode(stderr))
+
+
+async def run_many_async(jobs, concurrency=32, timeout=DEFAULT_TIMEOUT):
+    """
+    Run (script path, stdin) jobs concurrently, at most `concurrency` at a time.
+
+    Returns results in job order; a timed-out job yields its TimeoutExpired,
+    and a job whose output cannot be decoded or whose interpreter cannot be
+    started yields that UnicodeDecodeError/OSError, without affecting the
+    other jobs.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+
+    async def _one(script_path, input_data):
+        async with semaphore:
+            started = loop.time()
+            try:
+                result = await run_script_async(script_path, input_data, timeout)
+            except (subprocess.TimeoutExpired, UnicodeDecodeError, OSError) as exc:
+                result = exc
+            _record_timing(script_path, input_data, result, loop.time() - started,
+                           None, runner="async")
+            return result
+
+    return await asyncio.gather(*(_one(path, data) for path, data in jobs))
+
+
+def prefetch(jobs, concurrency=32, timeout=DEFAULT_TIMEOUT):
+    """
+    Execute (script path, stdin) jobs on an event loop and fill the run cache.
+
+    Later subprocess-runner run_script()/script_output() calls for the same
+    jobs are cache hits, so many repositories' scripts can be in flight at once. Jobs that
+    failed for another reason than a timeout are not cached: run_script()
+    runs them again and reports the error for that test alone.
+    """
+    pending = {}
+    for script_path, input_data in jobs:
+        # Each async job is a fresh interpreter, like the subprocess runner
+        key = _run_key(script_path, input_data, RUNNER_SUBPROCESS)
+        if key not in _RUN_CACHE and key not in pending:
+            pending[key] = (Path(script_path), input_data)
+    if not pending:
+        return
+    results = asyncio.run(run_many_async(pending.values(), concurrency, timeout))
+    _RUN_CACHE.update((key, result) for key, result in zip(pending, results)
+                      if not isinstance(result, (UnicodeDecodeError, OSError)))
+
+
+def suite_jobs(test_module, src_dir):
+    """Every (script path, stdin) run the visible test classes need for one src/ dir."""
+    jobs = []
+    for name, cls in vars(test_module).items():
+        script = getattr(cls, "SCRIPT", None) if name.startswith("Test") else None
+        if script:
+            jobs.extend((Path(src_dir) / script, data) for data in getattr(cls, "INPUTS", (None,)))
+    return jobs
+
+
+# ============================================================================
+# PARSED OUTPUT
+# ============================================================================
+
+_NUMBER = re.compile(r"[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+class ScriptOutput:
+    """
+    Structured view of one script run.
+
+    Lines of the form `Label: value` become fields, looked up by
+    lower-cased label (`Density`, `Drilling interval`, `Core volume`...).
+    When a label repeats - e.g. an input() prompt followed by the summary
+    line - the last occurrence wins.
+    """
+
+    def __init__(self, result):
+        self.result = result
+        self.returncode = result.returncode
+        self.stdout = result.stdout
+        self.stderr = result.stderr
+
+    @functools.cached_property
+    def lower(self):
+        """stdout lower-cased once, for case-insensitive substring checks."""
+        return self.stdout.lower()
+
+    @functools.cached_property
+    def fields(self):
+        """Mapping of lower-cased label -> raw value text."""
+        fields = {}
+        for line in self.stdout.splitlines():
+            label, sep, value = line.partition(":")
+            if sep and label.strip():
+                fields[label.strip().lower()] = value.strip()
+        return fields
+
+    def field(self, label, default=None):
+        """Raw value text for a label, or `default` if it was not printed."""
+        return self.fields.get(label.lower(), default)
+
+    def number(self, label):
+        """First number in a field's value as a float, or None."""
+        match = _NUMBER.search(self.field(label, ""))
+        return float(match.group()) if match else None
+
+    def integer(self, label):
+        """First number in a field's value as an int, or None."""
+        value = self.number(label)
+        return None if value is None or value != int(value) else int(value)
+
+
+# ============================================================================
+# INCREMENTAL RE-GRADING
+# ============================================================================
+
+class IncrementalState:
+    """
+    Test outcomes from previous runs, each stored with the content hash of
+    the script it ran against.
+
+    A stored outcome is replayed only while that script and the test suite
+    itself (test module, conftest, harness) are unchanged.
+    """
+
+    def __init__(self, path, suite_files):
+        self.path = Path(path)
+        self.suite_hash = hashlib.sha256(
+            "".join(hash_file(f) or "" for f in sorted(map(str, suite_files))).encode()
+        ).hexdigest()
+        self.results = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("suite_hash") == self.suite_hash:
+            self.results = data.get("results", {})
+
+    def stored_result(self, nodeid, script_path):
+        """The previous outcome for a test if its script is unchanged, else None."""
+        stored = self.results.get(nodeid)
+        if stored is None or stored["script_hash"] != hash_file(script_path):
+            return None
+        return stored
+
+    def record(self, nodeid, script_path, outcome, message=None):
+        """Store a test outcome together with the hash of the script it ran against."""
+        self.results[nodeid] = {
+            "outcome": outcome,
+            "message": message,
+            "script_hash": hash_file(script_path),
+        }
+
+    def save(self):
+        """Write the state file."""
+        self.path.write_text(json.dumps({
+            "suite_hash": self.suite_hash,
+            "results": self.results,
+        }, indent=1), encoding="utf-8")
+
+
+# ============================================================================
+# IN-PROCESS RUNNER
+# ============================================================================
+
+class _ScriptTimeout(BaseException):
+    """Raised inside student code when the in-process timeout fires."""
+
+
+def compile_script(script_path):
+    """Compile a script once per content hash; returns a code object."""
+    script_path = Path(script_path)
+    source = script_path.read_bytes()
+    key = (str(script_path), hashlib.sha256(source).hexdigest())
+    if key not in _CODE_CACHE:
+        _CODE_CACHE[key] = compile(source, str(script_path), "exec")
+    return _CODE_CACHE[key]
+
+
+def _exit_status(exc, stderr):
+    """Translate SystemExit into a process exit status, like the interpreter does."""
+    code = exc.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code & 0xFF
+    print(code, file=stderr)
+    return 1
+
+
+# Once the in-process timeout has expired, _ScriptTimeout is raised again at
+# this interval until the script gives up, in case it swallows the first one
+_TIMEOUT_REPEAT = 0.05
+
+
+def _restore_builtins(saved):
+    """Undo whatever a script added to, replaced in or deleted from builtins."""
+    current = vars(builtins)
+    for name in set(current) - set(saved):
+        del current[name]
+    for name, value in saved.items():
+        if current.get(name, saved) is not value:
+            current[name] = value
+
+
+def _run_inprocess(script_path, input_data, timeout):
+    """
+    Exec the script in a fresh namespace inside this interpreter.
+
+    Changes the script makes to builtins are undone and modules it imported
+    are dropped afterwards, so neither later scripts nor the tests see them.
+    """
+    args = [sys.executable, str(script_path)]
+    stdout, stderr = io.StringIO(), io.StringIO()
+
+    try:
+        code = compile_script(script_path)
+    except OSError as exc:
+        # Mirror the interpreter's "can't open file" failure
+        stderr.write(f"{sys.executable}: can't open file {str(script_path)!r}: {exc}\n")
+        return subprocess.CompletedProcess(args, 2, "", stderr.getvalue())
+    except SyntaxError:
+        traceback.print_exc(limit=0, file=stderr)
+        return subprocess.CompletedProcess(args, 1, "", stderr.getvalue())
+
+    namespace = {
+        "__name__": "__main__",
+        "__file__": str(script_path),
+        "__builtins__": builtins,
+    }
+    saved = (sys.stdin, sys.stdout, sys.stderr, sys.argv, list(sys.path))
+    saved_builtins = dict(vars(builtins))
+    saved_modules = set(sys.modules)
+    sys.stdin = io.StringIO(input_data or "")
+    sys.stdout, sys.stderr = stdout, stderr
+    sys.argv = [str(script_path)]
+    sys.path.insert(0, str(script_path.parent))
+
+    # SIGALRM can only be armed from the main thread; elsewhere run untimed
+    use_alarm = (
+        timeout is not None
+        and hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+    state = {"running": True, "expired": False}
+    if use_alarm:
+        def _on_alarm(signum, frame):
+            state["expired"] = True
+            if state["running"]:
+                raise _ScriptTimeout()
+        previous_handler = signal.signal(signal.SIGALRM, _on_alarm)
+        # Keeps firing after the deadline, so `except: pass` cannot outlast it
+        signal.setitimer(signal.ITIMER_REAL, timeout, _TIMEOUT_REPEAT)
+
+    returncode = 0
+    try:
+        try:
+            exec(code, namespace)
+        finally:
+            state["running"] = False
+    except _ScriptTimeout:
+        state["expired"] = True
+    except SystemExit as exc:
+        returncode = _exit_status(exc, stderr)
+    except Exception:
+        traceback.print_exc(file=stderr)
+        returncode = 1
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+        sys.stdin, sys.stdout, sys.stderr, sys.argv = saved[:4]
+        sys.path[:] = saved[4]
+        _restore_builtins(saved_builtins)
+        for name in set(sys.modules) - saved_modules:
+            del sys.modules[name]
+
+    if state["expired"]:
+        # Past the deadline the script would have been killed, however it ended
+        raise subprocess.TimeoutExpired(args, timeout, output=stdout.getvalue(),
+                                        stderr=stderr.getvalue())
+
+    return subprocess.CompletedProcess(args, returncode, stdout.getvalue(), stderr.getvalue())
+
+
+# ============================================================================
+# STATIC PRE-CHECK
+# ============================================================================
+
+# Runner name recorded in TIMINGS for results derived without executing
+STATIC = "static"
+
+# Opt-in (LAB1_STATIC_PRECHECK=1 or --lab1-precheck). When on it is applied
+# before the selected runner and evaluates scripts inside this process.
+_static_precheck = os.environ.get("LAB1_STATIC_PRECHECK", "0") != "0"
+
+# Static results keyed by (path, content hash); None means "must be run"
+_STATIC_CACHE = {}
+
+_QUIET_MODULES = {"math"}
+# math functions whose cost does not grow with their arguments (no factorial, comb, prod...)
+_MATH_FUNCTIONS = {
+    "acos", "asin", "atan", "atan2", "ceil", "cos", "degrees", "exp", "fabs", "floor",
+    "hypot", "isclose", "log", "log10", "log2", "pow", "radians", "sin", "sqrt", "tan",
+    "trunc",
+}
+_PURE_BUILTINS = {
+    "abs": abs, "bool": bool, "float": float, "int": int, "len": len, "max": max,
+    "min": min, "round": round, "str": str, "type": type,
+}
+_STR_METHODS = {
+    "capitalize", "center", "count", "endswith", "find", "isalpha", "isdigit",
+    "ljust", "lower", "lstrip", "replace", "rjust", "rstrip", "startswith",
+    "strip", "swapcase", "title", "upper", "zfill",
+}
+_BIN_OPS = {
+    ast.Add: lambda a, b: a + b, ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b, ast.Div: lambda a, b: a / b,
+    ast.FloorDiv: lambda a, b: a // b, ast.Mod: lambda a, b: a % b,
+    ast.Pow: lambda a, b: a ** b,
+}
+_UNARY_OPS = {ast.USub: lambda a: -a, ast.UAdd: lambda a: +a, ast.Not: lambda a: not a}
+_COMPARE_OPS = {
+    ast.Eq: lambda a, b: a == b, ast.NotEq: lambda a, b: a != b,
+    ast.Lt: lambda a, b: a < b, ast.LtE: lambda a, b: a <= b,
+    ast.Gt: lambda a, b: a > b, ast.GtE: lambda a, b: a >= b,
+}
+_MAX_TEXT = 100_000
+_MAX_INT_BITS = 4096
+_MAX_ROUND_DIGITS = 400
+_SPEC_NUMBER = re.compile(r"\d+")
+
+
+class _NotStatic(Exception):
+    """The script uses something the pre-check does not model; run it for real."""
+
+
+def set_static_precheck(enabled):
+    """Enable or disable the static pre-check."""
+    global _static_precheck
+    _static_precheck = bool(enabled)
+
+
+class StaticScript:
+    """
+    What can be known about a script from its AST alone.
+
+    Straight-line scripts built only from constant assignments, print()
+    calls, f-strings, arithmetic, simple str methods and the math module
+    are evaluated here, so `stdout` holds exactly what the interpreter
+    would print. For anything else `stdout` is None and the script has to
+    be run.
+
+    Evaluation happens in this process without a timeout, so every call
+    is restricted to functions whose cost is bounded by their argument
+    sizes, and those sizes (integers, string widths, format widths and
+    precisions, replacement lengths) are checked before the call is made.
+
+    Attributes:
+        stdout: the script's complete output, or None if it must be run
+    """
+
+    def __init__(self, source):
+        self.stdout = None
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError):
+            return
+        try:
+            stdout = self._execute(tree)
+        except _NotStatic:
+            return
+        except Exception:
+            # Runtime errors need the interpreter's exact traceback
+            return
+        # Non-ASCII and carriage returns depend on the child's encoding and newline translation
+        if stdout.isascii() and "\r" not in stdout:
+            self.stdout = stdout
+
+    def _execute(self, tree):
+        names = {}
+        out = []
+        for node in tree.body:
+            if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
+                continue  # docstrings
+            if isinstance(node, ast.Pass):
+                continue
+            if isinstance(node, ast.Import):
+                if any(alias.name not in _QUIET_MODULES for alias in node.names):
+                    raise _NotStatic()
+                for alias in node.names:
+                    names[alias.asname or alias.name] = __import__(alias.name)
+            elif isinstance(node, ast.ImportFrom):
+                if node.module not in _QUIET_MODULES or node.level:
+                    raise _NotStatic()
+                module = __import__(node.module)
+                for alias in node.names:
+                    if alias.name == "*":
+                        raise _NotStatic()
+                    value = getattr(module, alias.name, None)
+                    if callable(value) and alias.name not in _MATH_FUNCTIONS:
+                        raise _NotStatic()
+                    names[alias.asname or alias.name] = value
+            elif isinstance(node, ast.Assign):
+                value = self._eval(node.value, names)
+                for target in node.targets:
+                    if not isinstance(target, ast.Name):
+                        raise _NotStatic()
+                    names[target.id] = value
+            elif isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name):
+                op = _BIN_OPS.get(type(node.op))
+                if op is None or node.target.id not in names:
+                    raise _NotStatic()
+                left, right = names[node.target.id], self._eval(node.value, names)
+                self._check_operands(node.op, left, right)
+                names[node.target.id] = self._checked(op(left, right))
+            elif (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call)
+                    and isinstance(node.value.func, ast.Name) and node.value.func.id == "print"
+                    and "print" not in names):
+                out.append(self._print(node.value, names))
+            else:
+                raise _NotStatic()
+            if sum(map(len, out)) > _MAX_TEXT:
+                raise _NotStatic()
+        return "".join(out)
+
+    def _print(self, call, names):
+        options = {"sep": " ", "end": "\n"}
+        for keyword in call.keywords:
+            if keyword.arg not in options:
+                raise _NotStatic()  # file=, flush=, **kwargs
+            value = self._eval(keyword.value, names)
+            if value is not None and not isinstance(value, str):
+                raise _NotStatic()
+            options[keyword.arg] = options[keyword.arg] if value is None else value
+        if any(isinstance(arg, ast.Starred) for arg in call.args):
+            raise _NotStatic()
+        args = [str(self._eval(arg, names)) for arg in call.args]
+        return options["sep"].join(args) + options["end"]
+
+    @staticmethod
+    def _checked(value):
+        """Reject values whose size could make evaluation itself expensive."""
+        if isinstance(value, str) and len(value) > _MAX_TEXT:
+            raise _NotStatic()
+        if isinstance(value, int) and value.bit_length() > _MAX_INT_BITS:
+            raise _NotStatic()
+        return value
+
+    @staticmethod
+    def _check_operands(op, left, right):
+        """Bound the cost of a binary operation before performing it."""
+        if isinstance(op, ast.Pow):
+            if not isinstance(right, (int, float)) or abs(right) > 64:
+                raise _NotStatic()
+            if isinstance(left, int) and isinstance(right, int) \
+                    and left.bit_length() * abs(right) > _MAX_INT_BITS:
+                raise _NotStatic()
+        if isinstance(op, ast.Mult) and (isinstance(left, str) or isinstance(right, str)):
+            text, count = (left, right) if isinstance(left, str) else (right, left)
+            if not isinstance(count, int) or len(text) * max(count, 0) > _MAX_TEXT:
+                raise _NotStatic()
+
+    @staticmethod
+    def _check_call(name, target, args):
+        """Bound the size of what a whitelisted call can produce, before calling it."""
+        for arg in args:
+            StaticScript._checked(arg)
+        ints = [arg for arg in args if isinstance(arg, int) and not isinstance(arg, bool)]
+        if isinstance(target, str):
+            if any(abs(arg) > _MAX_TEXT for arg in ints):
+                raise _NotStatic()  # center/ljust/rjust/zfill widths
+            if name == "replace":
+                old, new = args[0], args[1]
+                if not (isinstance(old, str) and isinstance(new, str)):
+                    raise _NotStatic()
+                if len(target) + (target.count(old) * len(new)) > _MAX_TEXT:
+                    raise _NotStatic()
+        elif name == "round" and len(args) > 1:
+            if not isinstance(args[1], int) or abs(args[1]) > _MAX_ROUND_DIGITS:
+                raise _NotStatic()
+
+    @staticmethod
+    def _check_format_spec(spec):
+        """Reject format widths and precisions that would build huge strings."""
+        if any(int(number) > _MAX_TEXT for number in _SPEC_NUMBER.findall(spec)):
+            raise _NotStatic()
+
+    def _eval(self, node, names):
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, (bytes, complex)) or node.value is Ellipsis:
+                raise _NotStatic()
+            return self._checked(node.value)
+        if isinstance(node, ast.Name):
+            if node.id in names:
+                return names[node.id]
+            if node.id in ("True", "False", "None"):
+                return {"True": True, "False": False, "None": None}[node.id]
+            raise _NotStatic()
+        if isinstance(node, ast.BinOp):
+            op = _BIN_OPS.get(type(node.op))
+            if op is None:
+                raise _NotStatic()
+            left, right = self._eval(node.left, names), self._eval(node.right, names)
+            self._check_operands(node.op, left, right)
+            return self._checked(op(left, right))
+        if isinstance(node, ast.UnaryOp):
+            op = _UNARY_OPS.get(type(node.op))
+            if op is None:
+                raise _NotStatic()
+            return op(self._eval(node.operand, names))
+        if isinstance(node, ast.Compare):
+            left = self._eval(node.left, names)
+            for op_node, comparator in zip(node.ops, node.comparators):
+                op = _COMPARE_OPS.get(type(op_node))
+                if op is None:
+                    raise _NotStatic()
+                right = self._eval(comparator, names)
+                if not op(left, right):
+                    return False
+                left = right
+            return True
+        if isinstance(node, ast.BoolOp):
+            value = None
+            for operand in node.values:
+                value = self._eval(operand, names)
+                if isinstance(node.op, ast.And) and not value:
+                    return value
+                if isinstance(node.op, ast.Or) and value:
+                    return value
+            return value
+        if isinstance(node, ast.IfExp):
+            branch = node.body if self._eval(node.test, names) else node.orelse
+            return self._eval(branch, names)
+        if isinstance(node, ast.JoinedStr):
+            return self._checked("".join(str(self._eval(part, names)) for part in node.values))
+        if isinstance(node, ast.FormattedValue):
+            value = self._eval(node.value, names)
+            conversion = {-1: None, ord("s"): str, ord("r"): repr, ord("a"): ascii}
+            convert = conversion[node.conversion]
+            if convert is not None:
+                value = convert(value)
+            spec = "" if node.format_spec is None else self._eval(node.format_spec, names)
+            self._check_format_spec(spec)
+            return self._checked(format(value, spec))
+        if isinstance(node, ast.Subscript):
+            value = self._eval(node.value, names)
+            if not isinstance(value, str):
+                raise _NotStatic()
+            return value[self._eval(node.slice, names)]
+        if isinstance(node, ast.Slice):
+            return slice(*(None if part is None else self._eval(part, names)
+                           for part in (node.lower, node.upper, node.step)))
+        if isinstance(node, ast.Attribute):
+            value = self._eval(node.value, names)
+            if getattr(value, "__name__", None) in _QUIET_MODULES and not isinstance(value, str):
+                attribute = getattr(value, node.attr, None)
+                if callable(attribute) and node.attr not in _MATH_FUNCTIONS:
+                    raise _NotStatic()
+                return attribute
+            raise _NotStatic()
+        if isinstance(node, ast.Call):
+            if node.keywords or any(isinstance(arg, ast.Starred) for arg in node.args):
+                raise _NotStatic()
+            func = node.func
+            target = None
+            if isinstance(func, ast.Attribute):
+                target = self._eval(func.value, names)
+                name = func.attr
+                if isinstance(target, str) and name in _STR_METHODS:
+                    method = getattr(target, name)
+                elif getattr(target, "__name__", None) in _QUIET_MODULES \
+                        and name in _MATH_FUNCTIONS:
+                    method = getattr(target, name)
+                else:
+                    raise _NotStatic()
+            elif isinstance(func, ast.Name) and func.id in _PURE_BUILTINS and func.id not in names:
+                name = func.id
+                method = _PURE_BUILTINS[name]
+            elif isinstance(func, ast.Name) and callable(names.get(func.id)) \
+                    and getattr(names[func.id], "__name__", None) in _MATH_FUNCTIONS:
+                name = func.id
+                method = names[func.id]  # from math import sqrt
+            else:
+                raise _NotStatic()
+            args = [self._eval(arg, names) for arg in node.args]
+            self._check_call(name, target, args)
+            return self._checked(method(*args))
+        raise _NotStatic()
+
+
+def static_script(script_path):
+    """StaticScript for a file, computed once per content hash (None if unreadable)."""
+    try:
+        source = Path(script_path).read_bytes()
+    except OSError:
+        return None
+    key = (str(script_path), hashlib.sha256(source).hexdigest())
+    if key not in _STATIC_CACHE:
+        _STATIC_CACHE[key] = StaticScript(source)
+    return _STATIC_CACHE[key]
+
+
+def _run_static(script_path, input_data):
+    """The run result for a statically evaluable script, or None if it must be run."""
+    if not _static_precheck:
+        return None
+    static = static_script(script_path)
+    if static is None or static.stdout is None:
+        return None
+    # Never calls input(), so stdin is irrelevant
+    return subprocess.CompletedProcess([sys.executable, str(script_path)], 0, static.stdout, "")
+
+
+# ============================================================================
+# SANDBOXED WORKER POOL
+# ============================================================================
+
+# Pool sizing and per-worker limits (LAB1_POOL_SIZE overrides the size)
+POOL_SIZE = int(os.environ.get("LAB1_POOL_SIZE", os.cpu_count() or 1))
+POOL_MAX_JOBS = 200                 # recycle a worker after this many scripts
+POOL_MEMORY_LIMIT = 1024 ** 3       # RLIMIT_AS per worker, bytes
+POOL_CPU_LIMIT = DEFAULT_TIMEOUT    # RLIMIT_CPU budget per script, seconds
+
+# Extra wall time the parent waits for a reply after the script's own timeout
+_POOL_GRACE = 1.0
+
+_pool = None
+
+
+# Linux clone flags for unshare(2); os.unshare() only exists from Python 3.12
+_CLONE_NEWUSER = 0x10000000
+_CLONE_NEWNET = 0x40000000
+
+
+def _unshare_network():
+    """
+    Move this process into an empty network namespace (loopback down).
+
+    Tries CLONE_NEWNET alone (root / CAP_SYS_ADMIN), then together with a
+    new user namespace mapping the current uid/gid onto themselves, which
+    unprivileged users may do on most Linux kernels. Must be called while
+    the process is single-threaded. Returns True if it worked.
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    import ctypes
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+    except OSError:
+        return False
+    if libc.unshare(_CLONE_NEWNET) == 0:
+        return True
+    uid, gid = os.getuid(), os.getgid()
+    if libc.unshare(_CLONE_NEWUSER | _CLONE_NEWNET) != 0:
+        return False
+    try:
+        for name, text in (("setgroups", "deny"), ("uid_map", f"{uid} {uid} 1"),
+                           ("gid_map", f"{gid} {gid} 1")):
+            with open(f"/proc/self/{name}", "w") as f:
+                f.write(text)
+    except OSError:
+        pass  # still without network; only the id mapping is missing
+    return True
+
+
+def _sandbox():
+    """
+    Cut the worker off from the network; returns whether the OS enforces it.
+
+    socket.socket and getaddrinfo are blocked as well, but that only stops
+    code using the socket module: `_socket` and ctypes get past it. Only
+    the network namespace is a real block.
+    """
+    isolated = _unshare_network()
+    import socket
+
+    def _blocked(*args, **kwargs):
+        raise PermissionError("network access is disabled while grading")
+
+    class _BlockedSocket(socket.socket):
+        __init__ = _blocked
+
+    socket.socket = _BlockedSocket
+    socket.getaddrinfo = _blocked
+    return isolated
+
+
+def _limit_job(memory_limit, cpu_limit):
+    """RLIMIT_AS and RLIMIT_CPU for the forked child running one script."""
+    if resource is None:
+        return
+    if memory_limit:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    if cpu_limit:
+        _set_cpu_limit(cpu_limit)
+
+
+def _set_cpu_limit(seconds):
+    """Allow this process `seconds` more CPU time before SIGXCPU kills it."""
+    if resource is None or not seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime) + 1
+    hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+    soft = used + int(seconds)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _read_reply(fd, timeout):
+    """Everything written to `fd` until EOF, or None if `timeout` passes first."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    chunks = []
+    while True:
+        wait = None if deadline is None else max(deadline - time.monotonic(), 0)
+        ready, _, _ = select.select([fd], [], [], wait)
+        if not ready:
+            return None
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+def _run_forked(job, memory_limit):
+    """
+    Run one job in a child forked from the warm worker; returns the reply dict.
+
+    The child gets copy-on-write copies of builtins, sys.modules and every
+    module, so whatever a script patches is discarded with the child and
+    never reaches the next student's job.
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        status = 0
+        try:
+            _limit_job(memory_limit, job["cpu_limit"])
+            try:
+                result = _run_inprocess(Path(job["path"]), job["stdin"], job["timeout"])
+                reply = {"returncode": result.returncode,
+                         "stdout": result.stdout, "stderr": result.stderr}
+            except subprocess.TimeoutExpired as exc:
+                reply = {"timed_out": True, "stdout": exc.output, "stderr": exc.stderr}
+            with os.fdopen(write_fd, "wb") as out:
+                out.write(json.dumps(reply).encode())
+        except BaseException:
+            status = 70
+        finally:
+            os._exit(status)
+
+    os.close(write_fd)
+    try:
+        timeout = job["timeout"]
+        data = _read_reply(read_fd, None if timeout is None else timeout + _POOL_GRACE)
+    finally:
+        os.close(read_fd)
+    if data is None:
+        # The script ignored its alarm; only a kill stops it
+        os.kill(pid, signal.SIGKILL)
+    _, status, rusage = os.wait4(pid, 0)
+    if data is None:
+        reply = {"timed_out": True, "stdout": "", "stderr": ""}
+    elif not data:
+        # Died without replying: RLIMIT_CPU/AS, os._exit(), a segfault...
+        reply = {"returncode": os.waitstatus_to_exitcode(status), "stdout": "", "stderr": ""}
+    else:
+        reply = json.loads(data)
+    reply["usage"] = _child_usage(rusage)
+    return reply
+
+
+def _reply_result(args, reply, timeout):
+    """Turn a _run_forked() reply into a CompletedProcess, or raise TimeoutExpired."""
+    if reply.get("timed_out"):
+        result = subprocess.TimeoutExpired(args, timeout, output=reply["stdout"],
+                                           stderr=reply["stderr"])
+    else:
+        result = subprocess.CompletedProcess(args, reply["returncode"],
+                                             reply["stdout"], reply["stderr"])
+    usage = reply.get("usage")
+    result.usage = None if usage is None else tuple(usage)
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+def _worker_main(memory_limit):
+    """
+    Worker loop: read one JSON job per line, run it in a forked child, reply.
+
+    The job pipe is moved off fds 0/1 first, so student code that reads
+    or writes the raw descriptors cannot corrupt the protocol. The first
+    reply line reports whether the network namespace could be set up.
+    """
+    jobs = os.fdopen(os.dup(0), "rb")
+    replies = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    replies.write(json.dumps({"network_isolated": _sandbox()}).encode() + b"\n")
+    replies.flush()
+
+    for line in jobs:
+        reply = _run_forked(json.loads(line), memory_limit)
+        replies.write(json.dumps(reply).encode() + b"\n")
+        replies.flush()
+
+
+class _PoolWorker:
+    """One long-lived worker interpreter and its job pipe."""
+
+    def __init__(self, memory_limit):
+        self.process = subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "--worker", str(memory_limit)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self.jobs = 0
+        self.network_isolated = None
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def wait_ready(self):
+        """Read the worker's start-up line (whether its network namespace is in place)."""
+        if self.network_isolated is None:
+            line = self.process.stdout.readline()
+            self.network_isolated = bool(line) and json.loads(line)["network_isolated"]
+        return self.network_isolated
+
+    def run(self, script_path, input_data, timeout, cpu_limit):
+        """Send one job and wait for its reply; a dead worker reports its exit status."""
+        args = [sys.executable, str(script_path)]
+        job = {"path": str(script_path), "stdin": input_data,
+               "timeout": timeout, "cpu_limit": cpu_limit}
+        self.wait_ready()
+        self.jobs += 1
+        try:
+            self.process.stdin.write(json.dumps(job).encode() + b"\n")
+            self.process.stdin.flush()
+        except BrokenPipeError:
+            return subprocess.CompletedProcess(args, self.process.wait(), "", "")
+
+        # The worker kills a job that outlives timeout + grace itself
+        wait = None if timeout is None else timeout + 2 * _POOL_GRACE
+        ready, _, _ = select.select([self.process.stdout], [], [], wait)
+        if not ready:
+            # The worker itself is stuck; only a kill stops it
+            self.close()
+            raise subprocess.TimeoutExpired(args, timeout)
+        line = self.process.stdout.readline()
+        if not line:
+            # The worker itself died
+            return subprocess.CompletedProcess(args, self.process.wait(), "", "")
+        return _reply_result(args, json.loads(line), timeout)
+
+    def close(self):
+        """Stop the worker (killing it if it is busy)."""
+        if self.alive():
+            self.process.kill()
+        self.process.wait()
+        self.process.stdin.close()
+        self.process.stdout.close()
+
+
+class WorkerPool:
+    """
+    Pre-started worker interpreters that run student scripts in isolation.
+
+    Each script runs in a child forked from a warm worker, under its own
+    RLIMIT_AS and RLIMIT_CPU, so a job costs a fork() and an exec() of the
+    cached code rather than an interpreter start-up, and nothing a script
+    changes (builtins, modules, globals) outlives it. Workers live in an
+    empty network namespace where the kernel allows it; `network_isolated`
+    says whether every worker got one (otherwise only the socket module is
+    blocked). A worker is replaced as soon as it dies, hangs or has served
+    `max_jobs` scripts. Linux/POSIX only.
+    """
+
+    def __init__(self, size=None, max_jobs=POOL_MAX_JOBS,
+                 memory_limit=POOL_MEMORY_LIMIT, cpu_limit=POOL_CPU_LIMIT):
+        self.size = size or POOL_SIZE
+        self.max_jobs = max_jobs
+        self.memory_limit = memory_limit
+        self.cpu_limit = cpu_limit
+        self._idle = queue.Queue()
+        workers = [_PoolWorker(memory_limit) for _ in range(self.size)]
+        self.network_isolated = all([worker.wait_ready() for worker in workers])
+        for worker in workers:
+            self._idle.put(worker)
+
+    def run(self, script_path, input_data=None, timeout=DEFAULT_TIMEOUT):
+        """Run one script on an idle worker; same result contract as run_script()."""
+        worker = self._idle.get()
+        try:
+            return worker.run(Path(script_path), input_data, timeout, self.cpu_limit)
+        finally:
+            if not worker.alive() or worker.jobs >= self.max_jobs:
+                worker.close()
+                worker = _PoolWorker(self.memory_limit)
+            self._idle.put(worker)
+
+    def map(self, jobs, timeout=DEFAULT_TIMEOUT):
+        """
+        Run (script path, stdin) jobs across all workers.
+
+        Returns results in job order; a timed-out job yields its TimeoutExpired.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        def _one(job):
+            try:
+                return self.run(job[0], job[1], timeout)
+            except subprocess.TimeoutExpired as exc:
+                return exc
+
+        with ThreadPoolExecutor(self.size) as executor:
+            return list(executor.map(_one, jobs))
+
+    def close(self):
+        """Stop every worker."""
+        for _ in range(self.size):
+            self._idle.get().close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def get_pool():
+    """The session's shared WorkerPool, started on first use."""
+    global _pool
+    if _pool is None:
+        _pool = WorkerPool()
+        atexit.register(_pool.close)
+    return _pool
+
+
+def _run_pool(script_path, input_data, timeout):
+    """Run the script on the shared sandboxed worker pool."""
+    return get_pool().run(script_path, input_data, timeout)
+
+
+# Runner name for run_scenarios(): in-process execution in a forked child
+SCENARIO = "scenario"
+
+
+def _run_scenario(script_path, input_data, timeout):
+    """Exec the script in a child forked from this process (a fresh interpreter on Windows)."""
+    if not hasattr(os, "fork"):
+        return _run_subprocess(script_path, input_data, timeout)
+    try:
+        compile_script(script_path)  # once here; every child inherits the code object
+    except (OSError, SyntaxError):
+        pass  # the child reports it like the interpreter would
+    job = {"path": str(script_path), "stdin": input_data,
+           "timeout": timeout, "cpu_limit": POOL_CPU_LIMIT}
+    return _reply_result([sys.executable, str(script_path)],
+                         _run_forked(job, POOL_MEMORY_LIMIT), timeout)
+
+
+# ============================================================================
+# PROFILING
+# ============================================================================
+
+# Runner name recorded in TIMINGS for profiled executions
+PROFILE = "profile"
+
+# Hot functions kept per profiled run; 0 disables profiling.
+# Set with `pytest --lab1-profile[=N]` or the LAB1_PROFILE env var.
+_profile_top = int(os.environ.get("LAB1_PROFILE", "0") or 0)
+
+# Seconds a timed-out profiled script gets to write its profile after SIGTERM
+_PROFILE_GRACE = 2.0
+
+
+class _ProfileInterrupted(BaseException):
+    """Raised inside a profiled script when the parent stops it at the timeout."""
+
+
+def set_profile(top_n):
+    """Profile every executed script, keeping the `top_n` hottest functions (0: off)."""
+    global _profile_top
+    _profile_top = int(top_n or 0)
+
+
+def get_profile():
+    """Number of hot functions kept per profiled run (0 when profiling is off)."""
+    return _profile_top
+
+
+def _profile_main(out_path, top_n, script_path):
+    """
+    Profiling wrapper: run a script as __main__ under cProfile.
+
+    The profile is written to out_path as JSON when the script ends, fails,
+    or receives SIGTERM. In the last case it also records the line the
+    script was executing, which tells a loop that never ends from one that
+    is merely slow.
+    """
+    import cProfile
+    import pstats
+    import runpy
+
+    script_path = os.path.abspath(script_path)
+    interrupted_at = []
+
+    def _on_term(signum, frame):
+        interrupted_at.extend(
+            {"file": entry.filename, "line": entry.lineno, "function": entry.name}
+            for entry in traceback.extract_stack(frame)
+            if entry.filename == script_path
+        )
+        raise _ProfileInterrupted()
+
+    signal.signal(signal.SIGTERM, _on_term)
+    sys.argv = [script_path]
+    sys.path[0] = os.path.dirname(script_path)
+    profiler = cProfile.Profile()
+    exit_code = 0
+    cpu_started = time.process_time()
+    try:
+        profiler.enable()
+        runpy.run_path(script_path, run_name="__main__")
+    except _ProfileInterrupted:
+        exit_code = 124
+    except SystemExit as exc:
+        exit_code = _exit_status(exc, sys.stderr)
+    except BaseException as exc:
+        # Hide the wrapper's frames, as a plain `python script.py` would
+        tb = exc.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename != script_path:
+            tb = tb.tb_next
+        traceback.print_exception(type(exc), exc, tb or exc.__traceback__)
+        exit_code = 1
+    finally:
+        profiler.disable()
+
+    stats = pstats.Stats(profiler).stats
+    wrapper_files = {os.path.abspath(__file__), runpy.__file__, "<frozen runpy>"}
+    hot = sorted(
+        ((key, value) for key, value in stats.items() if key[0] not in wrapper_files),
+        key=lambda item: item[1][2], reverse=True,
+    )[:top_n]
+    profile = {
+        "cpu_time": round(time.process_time() - cpu_started, 6),
+        "interrupted_at": interrupted_at or None,
+        "hot": [
+            {"file": file, "line": line, "function": function, "calls": calls,
+             "tottime": round(tottime, 6), "cumtime": round(cumtime, 6)}
+            for (file, line, function), (_, calls, tottime, cumtime, _) in hot
+        ],
+    }
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(profile, f)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(exit_code)
+
+
+def _read_profile(path):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _run_profiled(script_path, input_data, timeout):
+    """
+    Run the script in a fresh interpreter under cProfile.
+
+    The profile is attached to the result (or to the TimeoutExpired) as
+    `.profile`. On timeout the script is sent SIGTERM first so it can
+    report where it was; it is killed if it does not stop within
+    _PROFILE_GRACE seconds.
+    """
+    import tempfile
+
+    args = [sys.executable, str(script_path)]
+    with tempfile.TemporaryDirectory() as tmp:
+        out_path = Path(tmp) / "profile.json"
+        process = subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "--profile", str(out_path),
+             str(_profile_top), str(script_path)],
+            stdin=subprocess.DEVNULL if input_data is None else subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            stdout, stderr = process.communicate(input_data, timeout)
+        except subprocess.TimeoutExpired:
+            process.terminate()
+            try:
+                stdout, stderr = process.communicate(timeout=_PROFILE_GRACE)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                stdout, stderr = process.communicate()
+            exc = subprocess.TimeoutExpired(args, timeout, output=stdout, stderr=stderr)
+            exc.profile = _read_profile(out_path)
+            raise exc
+        result = subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
+        result.profile = _read_profile(out_path)
+        return result
+
+
+def format_profile(profile):
+    """Human-readable summary of a profile recorded by the profiling runner."""
+    if not profile:
+        return "no profile recorded"
+    lines = [f"CPU time: {profile['cpu_time']:.3f}s"]
+    if profile["interrupted_at"]:
+        where = profile["interrupted_at"][-1]
+        lines.append(f"Stopped at timeout in {where['function']} "
+                     f"({Path(where['file']).name}, line {where['line']})")
+    lines.append(f"{'tottime':>10} {'cumtime':>10} {'calls':>8}  function")
+    for entry in profile["hot"]:
+        lines.append(f"{entry['tottime']:>10.4f} {entry['cumtime']:>10.4f} {entry['calls']:>8}  "
+                     f"{entry['function']} ({Path(entry['file']).name}:{entry['line']})")
+    return "\n".join(lines)
+
+
+_EXECUTORS = {
+    RUNNER_SUBPROCESS: _run_subprocess,
+    RUNNER_INPROCESS: _run_inprocess,
+    RUNNER_POOL: _run_pool,
+    SCENARIO: _run_scenario,
+}
+
+
+if __name__ == "__main__" and sys.argv[1:2] == ["--worker"]:
+    _worker_main(int(sys.argv[2]))
+elif __name__ == "__main__" and sys.argv[1:2] == ["--profile"]:
+    _profile_main(sys.argv[2], int(sys.argv[3]), sys.argv[4])